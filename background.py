@@ -0,0 +1,78 @@
+import queue
+import threading
+
+# How often, in milliseconds, the Tk thread checks for finished background work
+POLL_INTERVAL = 50
+
+class BackgroundTask:
+    """
+    Runs slow work (solver rankings, chart rendering) on one worker thread so the Tk mainloop never waits for it.
+
+    Only the newest submitted job matters: a job that is still queued when a newer one arrives is
+    dropped without running, and the result of a job that was superseded while running is thrown away.
+    Results are handed back to the Tk thread by polling with 'root.after', Tk widgets are never touched
+    from the worker thread.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        # Number of the newest job, and of the newest job that delivered its result (or was cancelled)
+        self.generation = 0
+        self.delivered = 0
+        self.pending = None
+        self.results = queue.Queue()
+        self.condition = threading.Condition()
+        self.polling = False
+        threading.Thread(target=self.work, daemon=True).start()
+
+    @property
+    def busy(self):
+        return self.delivered != self.generation
+
+    def submit(self, function, on_done, on_error=None):
+        """
+        Runs 'function()' on the worker thread, then calls 'on_done(result)' (or 'on_error(exception)')
+        on the Tk thread unless another job was submitted or 'cancel' was called in the meantime.
+        """
+        with self.condition:
+            self.generation += 1
+            self.pending = (self.generation, function, on_done, on_error)
+            self.condition.notify()
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_INTERVAL, self.poll)
+
+    def cancel(self):
+        """
+        Drops the queued job and throws away the result of the running one, no callback is called.
+        """
+        with self.condition:
+            self.generation += 1
+            self.delivered = self.generation
+            self.pending = None
+
+    def work(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                generation, function, on_done, on_error = self.pending
+                self.pending = None
+            try:
+                outcome = (on_done, function())
+            except Exception as error:
+                outcome = (on_error, error)
+            self.results.put((generation, *outcome))
+
+    def poll(self):
+        while not self.results.empty():
+            generation, callback, value = self.results.get()
+            if generation != self.generation:
+                continue
+            self.delivered = generation
+            if callback:
+                callback(value)
+        if self.busy:
+            self.root.after(POLL_INTERVAL, self.poll)
+        else:
+            self.polling = False
@@ -0,0 +1,129 @@
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+import solver
+
+# Games that take more guesses than this count as failures
+MAX_GUESSES = 6
+
+# Games are stopped after this many guesses so a bad strategy can't loop forever
+GUESS_LIMIT = 20
+
+# Settings of the worker processes, set by initWorker
+_corpus = None
+_mode = "occurrences"
+_opener = None
+
+def initWorker(file_path, mode, opener):
+    """
+    Loads the word corpus once per worker process, every game played by the worker shares it.
+    """
+    global _corpus, _mode, _opener
+    _corpus = solver.loadCorpus(file_path)
+    _mode = mode
+    _opener = opener
+
+def playGame(answer):
+    """
+    Plays one game against 'answer', always guessing the top 'bestNextWords' pick.
+
+    Args:
+        answer (str): The answer of the game.
+
+    Returns:
+        tuple: (answer, number of guesses, list of seconds spent choosing each guess).
+    """
+    session = solver.SolverSession(_corpus)
+    turn_times = []
+
+    for guesses in range(1, GUESS_LIMIT + 1):
+        start = time.perf_counter()
+        if guesses == 1 and _opener:
+            guess = _opener
+        else:
+            data = session.currentData() if _mode == "occurrences" else None
+            guess = session.bestNextWords(1, data, _mode)[0][0]
+        turn_times.append(time.perf_counter() - start)
+
+        if guess == answer:
+            return answer, guesses, turn_times
+        session.filterWords(guess, solver.computePattern(guess, answer))
+
+    return answer, GUESS_LIMIT + 1, turn_times
+
+def runBenchmark(file_path="all-answers.csv", mode="occurrences", opener=None, processes=None, chunk_size=16, limit=None):
+    """
+    Plays the solver against every answer in 'file_path' across a process pool.
+
+    Args:
+        file_path (str): The answers CSV.
+        mode (str): Ranking mode passed to 'bestNextWords'.
+        opener (str): Fixed first guess, or None to rank the first guess too.
+        processes (int): Number of worker processes, defaults to the number of CPUs.
+        chunk_size (int): Number of games sent to a worker at a time.
+        limit (int): Only play the first 'limit' answers.
+
+    Returns:
+        dict: The benchmark report, see 'printReport'.
+    """
+    corpus = solver.loadCorpus(file_path)
+    # Build the pattern matrix cache once up front instead of in every worker
+    if mode != "occurrences":
+        corpus.patternMatrix()
+    answers = list(corpus.all_words[:limit] if limit else corpus.all_words)
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes, initializer=initWorker, initargs=(file_path, mode, opener)) as pool:
+        results = list(pool.imap_unordered(playGame, answers, chunksize=chunk_size))
+    elapsed = time.perf_counter() - start
+
+    guess_counts = np.array([guesses for _, guesses, _ in results])
+    turn_times = np.array([seconds for _, _, times in results for seconds in times])
+    distribution = {int(guesses): int(count) for guesses, count in zip(*np.unique(guess_counts, return_counts=True))}
+
+    return {
+        "games": len(results),
+        "distribution": distribution,
+        "mean_guesses": float(guess_counts.mean()),
+        "failure_rate": float((guess_counts > MAX_GUESSES).mean()),
+        "failures": sorted(answer for answer, guesses, _ in results if guesses > MAX_GUESSES),
+        "seconds": elapsed,
+        "games_per_second": len(results) / elapsed,
+        "turn_latency_ms": {
+            f"p{percentile}": float(np.percentile(turn_times, percentile) * 1000)
+            for percentile in (50, 90, 99)
+        },
+    }
+
+def printReport(report):
+    print(f"Games played: {report['games']} in {report['seconds']:.2f}s ({report['games_per_second']:.1f} games/s)")
+    print(f"Mean guesses: {report['mean_guesses']:.3f}")
+    print(f"Failure rate: {report['failure_rate'] * 100:.2f}% (more than {MAX_GUESSES} guesses)")
+    print("\nGuess distribution:")
+    for guesses, count in report["distribution"].items():
+        label = f"{guesses}" if guesses <= GUESS_LIMIT else f">{GUESS_LIMIT}"
+        print(f"{label:>4}: {count}")
+    print("\nPer-turn latency:")
+    for name, milliseconds in report["turn_latency_ms"].items():
+        print(f"{name:>4}: {milliseconds:.3f} ms")
+    if report["failures"]:
+        print(f"\nFailed answers: {', '.join(report['failures'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays the solver against every answer and reports solve quality and throughput.")
+    parser.add_argument("--answers", default="all-answers.csv", help="answers CSV to play against")
+    parser.add_argument("--mode", default="occurrences", help="bestNextWords ranking mode")
+    parser.add_argument("--opener", help="fixed first guess")
+    parser.add_argument("--processes", type=int, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="games sent to a worker at a time")
+    parser.add_argument("--limit", type=int, help="only play the first N answers")
+    args = parser.parse_args()
+
+    report = runBenchmark(args.answers, args.mode, args.opener, args.processes, args.chunk_size, args.limit)
+    printReport(report)
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,51 @@
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np
+from background import BackgroundTask
+
+# Resolution the charts are rendered at, in pixels per inch
+DPI = 100
+
+# Milliseconds to wait after the last resize before re-rendering the visible chart
+RESIZE_DELAY = 200
 
 class DataVisualizationOverlay:
+    """
+    Full-window overlay with charts of the possible words' letter statistics.
+    
+    The overlay is meant to be kept and reused: its figures and their artists (bars, value labels,
+    heatmap cells) are created once, and 'update' changes them in place for new data instead of
+    building new figures. 'destroy' releases the figures.
+    
+    Charts are only rendered when their tab is shown. Building, updating and drawing a figure happens
+    on a background thread into an Agg buffer, which the Tk thread then shows as an image; a placeholder
+    is shown until the first render of a tab is ready. Figures are only ever touched by that thread.
+    """
+    
     def __init__(self, parent, data, possible_words, close_callback):
         self.parent = parent
         self.data = data  # This is now the dictionary from fetchData()
         self.possible_words = possible_words
         self.close_callback = close_callback
+        self.figures = []
+        self.task = BackgroundTask(parent)
+        # Charts, their Tk images and the tabs whose image shows the current data, by tab index
+        self.charts = {}
+        self.images = {}
+        self.rendered = set()
+        self.rendered_sizes = {}
+        self.resize_job = None
         
         # Create the overlay frame
         self.create_overlay()
-        
+        self.update(data, possible_words)
+    
     def create_overlay(self):
         # Create a full-screen frame overlay
         self.overlay = tk.Frame(self.parent, bg="#121213")
-        self.overlay.place(x=0, y=0, relwidth=1, relheight=1)
+        self.show()
         
         # Create header with title and close button
         header_frame = tk.Frame(self.overlay, bg="#121213")
@@ -71,71 +99,118 @@ class DataVisualizationOverlay:
         
         tab_control.pack(expand=1, fill="both")
         
-        # Fill tabs with content
-        self.create_letter_frequency_tab(letter_freq_tab)
-        self.create_position_frequency_tab(position_freq_tab)
-        self.create_letter_occurrences_tab(letter_occurrences_tab)
+        # Fill tabs with a description and a placeholder, the charts are rendered when a tab is first shown
+        self.tab_control = tab_control
+        self.chart_labels = [
+            self.create_chart_frame(letter_freq_tab, "This chart shows the frequency of each letter across all positions."),
+            self.create_chart_frame(position_freq_tab, "This heatmap shows the frequency of each letter at each position in the word."),
+            self.create_chart_frame(letter_occurrences_tab, "This chart shows the number of words containing each letter.")
+        ]
+        
+        # Builders and updaters of each tab's chart, only called on the rendering thread
+        self.chart_builders = [
+            lambda: self.create_bar_chart(
+                'Letter Frequency in Possible Words',
+                'Frequency',
+                '#538d4e'
+            ),
+            self.create_position_frequency_chart,
+            lambda: self.create_bar_chart(
+                'Letter Occurrences in Possible Words',
+                'Number of Words',
+                '#3a7ca5'  # Different color to distinguish from frequency
+            )
+        ]
+        self.chart_updaters = [
+            lambda chart, data: self.update_bar_chart(chart, data['frequencies']),
+            lambda chart, data: self.update_position_frequency_chart(chart, data['positions']),
+            lambda chart, data: self.update_bar_chart(chart, data['occurrences'])
+        ]
+        
+        for tab, label in enumerate(self.chart_labels):
+            label.bind("<Configure>", lambda event, tab=tab: self.chart_resized(tab, event))
+        tab_control.bind("<<NotebookTabChanged>>", lambda event: self.render_selected())
     
-    def create_letter_frequency_tab(self, parent):
-        # Create a frame for the chart
-        chart_frame = tk.Frame(parent, bg="#121213")
-        chart_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    def show(self):
+        self.overlay.place(x=0, y=0, relwidth=1, relheight=1)
+        self.overlay.lift()
+    
+    def hide(self):
+        # A chart still rendering won't be seen, 'update' renders the current data again on 'show'
+        self.task.cancel()
+        self.overlay.place_forget()
+    
+    def update(self, data, possible_words):
+        """
+        Shows the statistics of new possible words, reusing the existing figures.
+        """
+        self.data = data
+        self.possible_words = possible_words
         
-        # Create description
-        description = tk.Label(
-            chart_frame,
-            text="This chart shows the frequency of each letter across all positions.",
-            font=('Inter', 12),
-            bg="#121213",
-            fg="#ffffff",
-            wraplength=1000,
-            anchor="w",
-            justify="left"
+        # Only the visible tab is rendered now, the others when they are selected
+        self.rendered.clear()
+        self.render_selected()
+    
+    def render_selected(self):
+        """
+        Renders the selected tab's chart on the background thread unless it already shows the current data.
+        """
+        tab = self.tab_control.index("current")
+        if tab in self.rendered:
+            return
+        
+        label = self.chart_labels[tab]
+        self.overlay.update_idletasks()
+        width, height = label.winfo_width(), label.winfo_height()
+        data = self.data
+        
+        self.task.submit(
+            lambda: self.render_chart(tab, data, width, height),
+            lambda image: self.show_chart(tab, data, image, (width, height))
         )
-        description.pack(pady=(0, 10), anchor="w")
-        
-        # Use frequencies from fetchData()
-        letter_counts = self.data['frequencies']
-        
-        # Sort by frequency
-        sorted_letters = sorted(letter_counts.items(), key=lambda x: x[1], reverse=True)
-        letters = [item[0] for item in sorted_letters]
-        counts = [item[1] for item in sorted_letters]
-        
-        # Create figure and plot
-        fig, ax = plt.subplots(figsize=(12, 6))
-        fig.patch.set_facecolor('#121213')
-        ax.set_facecolor('#121213')
-        
-        bars = ax.bar(letters, counts, color='#538d4e')
-        
-        # Styling
-        ax.set_title('Letter Frequency in Possible Words', color='white', fontsize=16)
-        ax.set_xlabel('Letters', color='white', fontsize=14)
-        ax.set_ylabel('Frequency', color='white', fontsize=14)
-        ax.tick_params(axis='x', colors='white')
-        ax.tick_params(axis='y', colors='white')
-        
-        # Add value labels on top of each bar
-        for bar in bars:
-            height = bar.get_height()
-            ax.annotate(f'{height}',
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3),  # 3 points vertical offset
-                        textcoords="offset points",
-                        ha='center', va='bottom',
-                        color='white')
-        
-        # Change spines color
-        for spine in ax.spines.values():
-            spine.set_color('#3a3a3c')
-        
-        # Embed the plot in Tkinter
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
     
-    def create_letter_occurrences_tab(self, parent):
+    def render_chart(self, tab, data, width, height):
+        """
+        Runs on the rendering thread: builds the tab's chart if needed, updates it with 'data' and draws it.
+
+        Returns:
+            bytes: The chart as a binary PPM image.
+        """
+        if tab not in self.charts:
+            self.charts[tab] = self.chart_builders[tab]()
+        chart = self.charts[tab]
+        self.chart_updaters[tab](chart, data)
+        
+        fig = chart["canvas"].figure
+        if width > 1 and height > 1:
+            fig.set_size_inches(width / DPI, height / DPI)
+        if chart.get("tight_layout"):
+            fig.tight_layout()
+        chart["canvas"].draw()
+        
+        # Tk reads binary PPM without any image library, which only needs the alpha channel dropped
+        pixels = np.asarray(chart["canvas"].buffer_rgba())[:, :, :3]
+        return b"P6 %d %d 255\n" % (pixels.shape[1], pixels.shape[0]) + pixels.tobytes()
+    
+    def show_chart(self, tab, data, image, size):
+        if data is not self.data:
+            return
+        self.images[tab] = tk.PhotoImage(data=image, format="PPM")
+        self.chart_labels[tab].config(image=self.images[tab], text="")
+        self.rendered.add(tab)
+        self.rendered_sizes[tab] = size
+    
+    def chart_resized(self, tab, event):
+        # Re-render once the size settles, charts are drawn at the size of their label
+        size = self.rendered_sizes.get(tab)
+        if size is None or (abs(event.width - size[0]) <= 2 and abs(event.height - size[1]) <= 2):
+            return
+        self.rendered.discard(tab)
+        if self.resize_job:
+            self.overlay.after_cancel(self.resize_job)
+        self.resize_job = self.overlay.after(RESIZE_DELAY, self.render_selected)
+    
+    def create_chart_frame(self, parent, text):
         # Create a frame for the chart
         chart_frame = tk.Frame(parent, bg="#121213")
         chart_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -143,7 +218,7 @@ class DataVisualizationOverlay:
         # Create description
         description = tk.Label(
             chart_frame,
-            text="This chart shows the number of words containing each letter.",
+            text=text,
             font=('Inter', 12),
             bg="#121213",
             fg="#ffffff",
@@ -153,84 +228,83 @@ class DataVisualizationOverlay:
         )
         description.pack(pady=(0, 10), anchor="w")
         
-        # Use occurrences from fetchData()
-        letter_occurrences = self.data['occurrences']
-        
-        # Sort by occurrences
-        sorted_letters = sorted(letter_occurrences.items(), key=lambda x: x[1], reverse=True)
-        letters = [item[0] for item in sorted_letters]
-        counts = [item[1] for item in sorted_letters]
-        
-        # Create figure and plot
-        fig, ax = plt.subplots(figsize=(12, 6))
+        # The rendered chart is shown as an image in this label, with a placeholder until it's ready
+        chart_label = tk.Label(
+            chart_frame,
+            text="Rendering chart...",
+            font=('Inter', 12, 'italic'),
+            bg="#121213",
+            fg="#818384"
+        )
+        chart_label.pack(fill=tk.BOTH, expand=True)
+        return chart_label
+    
+    def create_figure(self, figsize):
+        # Figures are not created through pyplot, so nothing outside the overlay keeps them alive
+        fig = Figure(figsize=figsize, dpi=DPI)
         fig.patch.set_facecolor('#121213')
+        ax = fig.add_subplot()
         ax.set_facecolor('#121213')
         
-        bars = ax.bar(letters, counts, color='#3a7ca5')  # Different color to distinguish from frequency
+        # Rendered off screen, 'render_chart' copies the pixels into the Tk label
+        canvas = FigureCanvasAgg(fig)
+        
+        self.figures.append(fig)
+        return fig, ax, canvas
+    
+    def create_bar_chart(self, title, ylabel, color):
+        fig, ax, canvas = self.create_figure((12, 6))
+        
+        # One bar per letter, the heights and labels are set by 'update_bar_chart'
+        positions = np.arange(26)
+        bars = ax.bar(positions, np.zeros(26), color=color)
+        ax.set_xticks(positions)
         
         # Styling
-        ax.set_title('Letter Occurrences in Possible Words', color='white', fontsize=16)
+        ax.set_title(title, color='white', fontsize=16)
         ax.set_xlabel('Letters', color='white', fontsize=14)
-        ax.set_ylabel('Number of Words', color='white', fontsize=14)
+        ax.set_ylabel(ylabel, color='white', fontsize=14)
         ax.tick_params(axis='x', colors='white')
         ax.tick_params(axis='y', colors='white')
         
         # Add value labels on top of each bar
-        for bar in bars:
-            height = bar.get_height()
-            ax.annotate(f'{height}',
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
+        labels = [
+            ax.annotate('',
+                        xy=(bar.get_x() + bar.get_width() / 2, 0),
                         xytext=(0, 3),  # 3 points vertical offset
                         textcoords="offset points",
                         ha='center', va='bottom',
                         color='white')
+            for bar in bars
+        ]
         
         # Change spines color
         for spine in ax.spines.values():
             spine.set_color('#3a3a3c')
         
-        # Embed the plot in Tkinter
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return {"ax": ax, "canvas": canvas, "bars": bars, "labels": labels}
     
-    def create_position_frequency_tab(self, parent):
-        # Create a frame for the chart
-        chart_frame = tk.Frame(parent, bg="#121213")
-        chart_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Create description
-        description = tk.Label(
-            chart_frame,
-            text="This heatmap shows the frequency of each letter at each position in the word.",
-            font=('Inter', 12),
-            bg="#121213",
-            fg="#ffffff",
-            wraplength=1000,
-            anchor="w",
-            justify="left"
-        )
-        description.pack(pady=(0, 10), anchor="w")
-        
-        # Use position data from fetchData()
-        position_freq = self.data['positions']
+    def update_bar_chart(self, chart, letter_counts):
+        # Sort by count
+        sorted_letters = sorted(letter_counts.items(), key=lambda x: x[1], reverse=True)
+        letters = [item[0] for item in sorted_letters]
+        counts = [item[1] for item in sorted_letters]
         
-        # Get all unique letters
-        all_letters = sorted(list(position_freq.keys()))
+        for bar, label, count in zip(chart["bars"], chart["labels"], counts):
+            bar.set_height(count)
+            label.set_text(f'{count}')
+            label.xy = (label.xy[0], count)
+        chart["ax"].set_xticks(np.arange(len(letters)), letters)
+        chart["ax"].set_ylim(0, max(max(counts), 1) * 1.1)
+    
+    def create_position_frequency_chart(self):
+        fig, ax, canvas = self.create_figure((12, 8))
         
-        # Create a matrix for heatmap
-        matrix = np.zeros((5, len(all_letters)))
-        for i, letter in enumerate(all_letters):
-            for pos in range(5):
-                matrix[pos, i] = position_freq[letter][pos]
-        
-        # Create figure and plot
-        fig, ax = plt.subplots(figsize=(12, 8))
-        fig.patch.set_facecolor('#121213')
-        ax.set_facecolor('#121213')
+        # Every letter gets a column, the cell values are set by 'update_position_frequency_chart'
+        all_letters = [chr(ord('a') + i) for i in range(26)]
         
         # Create horizontal heatmap
-        im = ax.imshow(matrix, cmap='YlGnBu', aspect='auto', origin='lower')
+        im = ax.imshow(np.zeros((5, len(all_letters))), cmap='YlGnBu', aspect='auto', origin='lower')
         
         # Styling
         ax.set_title('Letter Frequency by Position', color='white', fontsize=16)
@@ -242,31 +316,50 @@ class DataVisualizationOverlay:
         ax.tick_params(axis='x', colors='white')
         ax.tick_params(axis='y', colors='white')
         
-        # Add colorbar
-        cbar = plt.colorbar(im, ax=ax)
+        # Add colorbar, it follows the color limits of the heatmap
+        cbar = fig.colorbar(im, ax=ax)
         cbar.ax.tick_params(colors='white')
         cbar.set_label('Frequency', color='white')
         
-        # Loop over data dimensions and create text annotations
-        for i in range(5):
-            for j in range(len(all_letters)):
-                if matrix[i, j] > 0:
-                    # Adjust text color based on background intensity
-                    text_color = "black" if matrix[i, j] < matrix.max()/2 else "white"
-                    ax.text(j, i, int(matrix[i, j]),
-                            ha="center", va="center", color=text_color,
-                            fontweight='bold')
+        # One text annotation per cell, hidden while the cell is empty
+        texts = [
+            [ax.text(j, i, '', ha="center", va="center", fontweight='bold') for j in range(len(all_letters))]
+            for i in range(5)
+        ]
         
         # Change spines color
         for spine in ax.spines.values():
             spine.set_color('#3a3a3c')
         
-        plt.tight_layout()
+        return {"canvas": canvas, "image": im, "letters": all_letters, "texts": texts, "tight_layout": True}
+    
+    def update_position_frequency_chart(self, chart, position_freq):
+        # Create a matrix for heatmap
+        matrix = np.array([position_freq[letter] for letter in chart["letters"]], dtype=float).T
+        
+        chart["image"].set_data(matrix)
+        chart["image"].set_clim(0, max(matrix.max(), 1))
         
-        # Create a new Tkinter canvas
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        for i in range(5):
+            for j in range(len(chart["letters"])):
+                text = chart["texts"][i][j]
+                text.set_visible(matrix[i, j] > 0)
+                if matrix[i, j] > 0:
+                    # Adjust text color based on background intensity
+                    text.set_text(int(matrix[i, j]))
+                    text.set_color("black" if matrix[i, j] < matrix.max()/2 else "white")
+    
+    def release_figures(self):
+        for fig in self.figures:
+            fig.clear()
+        self.figures = []
+        self.charts = {}
     
     def destroy(self):
-        self.overlay.destroy()
\ No newline at end of file
+        """
+        Destroys the overlay and releases its figures.
+        """
+        # Released on the rendering thread, after any render still in progress
+        self.task.submit(self.release_figures, None)
+        self.images = {}
+        self.overlay.destroy()
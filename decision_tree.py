@@ -0,0 +1,66 @@
+import argparse
+import sys
+
+import numpy as np
+
+import solver
+
+# Branches deeper than this are not expanded, a strategy that stops splitting can't recurse forever
+MAX_DEPTH = 20
+
+def buildDecisionTree(corpus, opener, mode="occurrences"):
+    """
+    Plays out every answer in 'corpus' from 'opener', recording the guess chosen after each feedback path.
+
+    Args:
+        corpus (solver.WordCorpus): The word lists to build the tree from.
+        opener (str): The first guess.
+        mode (str): The 'bestNextWords' ranking mode used for every later guess.
+
+    Returns:
+        solver.DecisionTree: The finished tree.
+    """
+    matrix = corpus.patternMatrix()
+    scorer = solver.findScorer(mode)
+    guesses = {}
+
+    def expand(candidates, patterns, guess):
+        guesses[solver.DecisionTree.pathKey(patterns)] = guess
+        if len(patterns) >= MAX_DEPTH:
+            return
+
+        columns = np.array([corpus.word_index[word] for word in candidates], dtype=np.intp)
+        feedback = matrix[corpus.input_index[guess], columns]
+        for pattern in np.unique(feedback):
+            if pattern == solver.NUM_PATTERNS - 1:
+                continue
+            bucket = [candidates[i] for i in np.flatnonzero(feedback == pattern)]
+            if len(bucket) == 1:
+                next_guess = bucket[0]
+            else:
+                data = solver.fetchData(bucket) if mode == "occurrences" else None
+                next_guess = scorer.rank(corpus, bucket, data, 1)[0][0]
+            expand(bucket, patterns + [int(pattern)], next_guess)
+
+    expand(list(corpus.all_words), [], opener)
+    return solver.DecisionTree(mode, opener, corpus.digest(), guesses)
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds a decision tree file for a fixed opener and ranking mode.")
+    parser.add_argument("opener", help="first guess")
+    parser.add_argument("--answers", default="all-answers.csv", help="answers CSV")
+    parser.add_argument("--mode", default="occurrences", help="bestNextWords ranking mode")
+    parser.add_argument("--output", help="output file (default: decision-tree-<mode>-<opener>.json)")
+    args = parser.parse_args()
+
+    corpus = solver.loadCorpus(args.answers)
+    if not corpus.validInput(args.opener) or args.opener == "filler":
+        sys.exit(f"Invalid opener: {args.opener}")
+
+    tree = buildDecisionTree(corpus, args.opener, args.mode)
+    output = args.output or f"decision-tree-{args.mode}-{args.opener}.json"
+    tree.save(output)
+    print(f"Saved {len(tree.guesses)} suggestions to {output}")
+
+if __name__ == "__main__":
+    main()
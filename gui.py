@@ -1,7 +1,9 @@
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
+from tkinter import messagebox
 import solver
+from background import BackgroundTask
 from data_visualizer import DataVisualizationOverlay
+from instrumentation import metrics
 
 COLORS = {
     "background": "#121213",
@@ -17,6 +19,158 @@ COLORS = {
     "button_text": "#000000"
 }
 
+# How often, in milliseconds, the metrics panel is refreshed
+METRICS_REFRESH = 1000
+
+class VirtualList(tk.Frame):
+    """
+    A read-only scrolling list that only renders the rows in view.
+
+    Rows are fetched from a 'rows(start, stop)' function when they scroll into view, so a list of
+    thousands of words costs as much to show as one screenful.
+    """
+
+    def __init__(self, parent, width, height, font, bg, fg):
+        super().__init__(parent, bg=bg, bd=1, relief="solid")
+        self.height = height
+        self.total = 0
+        self.first = 0
+        self.rows = lambda start, stop: []
+        
+        self.text = tk.Text(
+            self,
+            width=width,
+            height=height,
+            font=font,
+            bg=bg,
+            fg=fg,
+            bd=0,
+            wrap=tk.NONE,
+            state=tk.DISABLED
+        )
+        self.scrollbar = tk.Scrollbar(self, command=self.scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.text.bind("<MouseWheel>", lambda event: self.scroll("scroll", -1 if event.delta > 0 else 1, "units"))
+        self.text.bind("<Button-4>", lambda event: self.scroll("scroll", -1, "units"))
+        self.text.bind("<Button-5>", lambda event: self.scroll("scroll", 1, "units"))
+    
+    def show(self, total, rows):
+        """
+        Shows 'total' rows from the top, 'rows(start, stop)' returns the text of rows 'start' to 'stop'.
+        """
+        self.total = total
+        self.rows = rows
+        self.first = 0
+        self.render()
+    
+    def show_message(self, message):
+        self.show(1, lambda start, stop: [message])
+    
+    def clear(self):
+        self.show(0, lambda start, stop: [])
+    
+    def scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            first = int(float(amount) * self.total)
+        else:
+            first = self.first + int(amount) * (self.height if unit == "pages" else 1)
+        self.first = max(0, min(first, self.total - self.height))
+        self.render()
+        return "break"
+    
+    def render(self):
+        stop = min(self.first + self.height, self.total)
+        lines = self.rows(self.first, stop) if stop > self.first else []
+        
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, "\n".join(lines))
+        self.text.config(state=tk.DISABLED)
+        
+        if self.total:
+            self.scrollbar.set(self.first / self.total, stop / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+class MetricsPanel:
+    """
+    Debug window showing the solver instrumentation, refreshed every 'METRICS_REFRESH' milliseconds.
+    Recording is turned on while the window is open.
+    """
+
+    def __init__(self, root, close_callback):
+        self.close_callback = close_callback
+        self.was_enabled = metrics.enabled
+        metrics.enable()
+        
+        self.window = tk.Toplevel(root, bg=COLORS["background"])
+        self.window.title("Solver Metrics")
+        self.window.protocol("WM_DELETE_WINDOW", close_callback)
+        
+        self.text = tk.Text(
+            self.window,
+            width=100,
+            height=24,
+            font=('Courier', 11),
+            bg=COLORS["background"],
+            fg=COLORS["text"],
+            state=tk.DISABLED
+        )
+        self.text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        buttons = tk.Frame(self.window, bg=COLORS["background"])
+        buttons.pack(pady=(0, 10))
+        for text, command in (
+            ("Reset", metrics.reset),
+            ("Copy JSON", lambda: self.copy(metrics.toJSON(indent=2))),
+            ("Copy Prometheus", lambda: self.copy(metrics.toPrometheus()))
+        ):
+            tk.Button(
+                buttons,
+                text=text,
+                font=('Inter', 12),
+                bg=COLORS["keyboard_key"],
+                fg=COLORS["button_text"],
+                command=command
+            ).pack(side=tk.LEFT, padx=5)
+        
+        self.refresh()
+    
+    def copy(self, text):
+        self.window.clipboard_clear()
+        self.window.clipboard_append(text)
+    
+    def refresh(self):
+        data = metrics.toDict()
+        
+        lines = [f"{'operation':<24}{'calls':>7}{'total s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'in':>8}{'out':>8}"]
+        for name, stats in data["operations"].items():
+            latency = {key: "-" if value is None else f"{value * 1000:.2f}" for key, value in stats["latency_seconds"].items()}
+            size_in = "-" if stats["last_size_in"] is None else stats["last_size_in"]
+            size_out = "-" if stats["last_size_out"] is None else stats["last_size_out"]
+            lines.append(
+                f"{name:<24}{stats['calls']:>7}{stats['seconds']:>10.3f}"
+                f"{latency['p50']:>9}{latency['p90']:>9}{latency['p99']:>9}{size_in:>8}{size_out:>8}"
+            )
+        lines.append("")
+        lines.append(f"{'cache':<24}{'hits':>7}{'misses':>10}{'hit rate':>10}")
+        for name, counts in data["caches"].items():
+            lines.append(f"{name:<24}{counts['hits']:>7}{counts['misses']:>10}{counts['hit_rate'] * 100:>9.1f}%")
+        
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, "\n".join(lines))
+        self.text.config(state=tk.DISABLED)
+        
+        self.refresh_job = self.window.after(METRICS_REFRESH, self.refresh)
+    
+    def destroy(self):
+        self.window.after_cancel(self.refresh_job)
+        self.window.destroy()
+        metrics.enable(self.was_enabled)
+
 class WordleSolverGUI:
     def __init__(self, root):
         self.root = root
@@ -24,7 +178,8 @@ class WordleSolverGUI:
         self.root.config(bg=COLORS["background"])
         self.root.geometry("1280x720")
         
-        solver.fetchWords('all-answers.csv')
+        self.task = BackgroundTask(root)
+        self.ready = False
         
         self.current_row = 0
         self.current_col = 0
@@ -33,7 +188,10 @@ class WordleSolverGUI:
         self.position_values = []
         self.current_focused_widget = None
         self.guess_validated = False
+        # (row, position values the solver still has) while an edit of an earlier row can't be applied
+        self.invalid_edit = None
         self.data_overlay = None
+        self.metrics_panel = None
         
         self.container = tk.Frame(root, bg=COLORS["background"])
         self.container.pack(expand=True)
@@ -49,12 +207,32 @@ class WordleSolverGUI:
         self.create_data_button()
         self.create_reset_button()
         
-        self.update_word_statistics()
-        
         self.root.bind("<Key>", self.key_pressed)
         self.root.bind("<Button-1>", self.check_focus_area)
+        self.root.bind("<Control-z>", lambda event: self.undo_guess())
+        self.root.bind("<Control-y>", lambda event: self.redo_guess())
+        self.root.bind("<Control-Shift-Z>", lambda event: self.redo_guess())
+        self.root.bind("<F12>", lambda event: self.toggle_metrics_panel())
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
-        self.update_directions("Please enter a valid word and press RETURN/ENTER")
+        self.load_words()
+    
+    def load_words(self):
+        self.update_directions("Loading word lists...")
+        self.show_computing(True)
+        hard_mode = self.hard_mode.get()
+        
+        def load():
+            solver.fetchWords('all-answers.csv', hard_mode)
+            return solver.rankLater()()
+        
+        self.task.submit(load, self.words_loaded, self.computing_failed)
+    
+    def words_loaded(self, ranking):
+        self.ready = True
+        self.remaining_words_label.config(text=f"Possible Words: {len(solver.possible_words)}")
+        self.show_word_statistics(ranking)
+        self.update_directions("Please enter a valid word and press RETURN/ENTER (Ctrl+Z/Ctrl+Y to undo/redo a guess)")
     
     def create_header(self):
         tk.Label(
@@ -96,13 +274,22 @@ class WordleSolverGUI:
         
         self.remaining_words_label = tk.Label(
             left_panel,
-            text=f"Possible Words: {len(solver.possible_words)}",
+            text="Possible Words: ...",
             font=('Inter', 14, 'bold'),
             bg=COLORS["background"],
             fg=COLORS["text"]
         )
         self.remaining_words_label.pack(pady=(0, 10))
         
+        self.computing_label = tk.Label(
+            left_panel,
+            text="",
+            font=('Inter', 12, 'italic'),
+            bg=COLORS["background"],
+            fg=COLORS["yellow_tile"]
+        )
+        self.computing_label.pack(pady=(0, 5))
+        
         tk.Label(
             left_panel,
             text="Best Next Words:",
@@ -111,16 +298,13 @@ class WordleSolverGUI:
             fg=COLORS["text"]
         ).pack(pady=(0, 5))
         
-        self.word_suggestions = scrolledtext.ScrolledText(
+        self.word_suggestions = VirtualList(
             left_panel,
             width=25,
             height=25,
             font=('Courier', 12),
             bg=COLORS["background"],
-            fg=COLORS["text"],
-            bd=1,
-            relief="solid",
-            borderwidth=1
+            fg=COLORS["text"]
         )
         self.word_suggestions.pack(fill=tk.BOTH, expand=True)
         
@@ -184,16 +368,39 @@ class WordleSolverGUI:
         ).pack()
     
     def show_data_overlay(self):
+        if not self.ready:
+            return
         if len(solver.possible_words) > 0:
-            data = solver.fetchData(solver.possible_words)
-            self.data_overlay = DataVisualizationOverlay(self.root, data, solver.possible_words, self.hide_data_overlay)
+            data = solver.currentData()
+            # The overlay is kept after it is first opened so later opens reuse its figures
+            if self.data_overlay is None:
+                self.data_overlay = DataVisualizationOverlay(self.root, data, solver.possible_words, self.hide_data_overlay)
+            else:
+                self.data_overlay.show()
+                self.data_overlay.update(data, solver.possible_words)
         else:
             messagebox.showinfo("No Data", "No possible words available to analyze.")
     
     def hide_data_overlay(self):
+        if self.data_overlay:
+            self.data_overlay.hide()
+    
+    def toggle_metrics_panel(self):
+        if self.metrics_panel:
+            self.metrics_panel.destroy()
+            self.metrics_panel = None
+        else:
+            self.metrics_panel = MetricsPanel(self.root, self.toggle_metrics_panel)
+    
+    def close(self):
+        # A ranking finishing during teardown must not touch the destroyed widgets
+        self.task.cancel()
+        if self.metrics_panel:
+            self.toggle_metrics_panel()
         if self.data_overlay:
             self.data_overlay.destroy()
             self.data_overlay = None
+        self.root.destroy()
     
     def create_right_panel(self):
         right_panel = tk.Frame(self.main_frame, bg=COLORS["background"])
@@ -236,26 +443,37 @@ class WordleSolverGUI:
             command=self.search_filler_words
         ).pack(pady=(0, 10))
         
-        self.filler_results = scrolledtext.ScrolledText(
+        self.filler_results = VirtualList(
             right_panel,
             width=25,
             height=20,
             font=('Courier', 12),
             bg=COLORS["background"],
-            fg=COLORS["text"],
-            bd=1,
-            relief="solid",
-            borderwidth=1
+            fg=COLORS["text"]
         )
         self.filler_results.pack(fill=tk.BOTH, expand=True)
         
         right_panel.bind("<Button-1>", lambda event: self.check_click_source(event, "right_panel"))
-        self.filler_results.bind("<Button-1>", lambda event: self.check_click_source(event, "filler_results"))
+        self.filler_results.text.bind("<Button-1>", lambda event: self.check_click_source(event, "filler_results"))
     
     def create_reset_button(self):
         reset_frame = tk.Frame(self.main_frame, bg=COLORS["background"])
         reset_frame.grid(row=3, column=2, sticky="se", pady=(20, 0))
         
+        self.hard_mode = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            reset_frame,
+            text="Hard Mode",
+            font=('Inter', 12),
+            variable=self.hard_mode,
+            bg=COLORS["background"],
+            fg=COLORS["text"],
+            selectcolor=COLORS["background"],
+            activebackground=COLORS["background"],
+            activeforeground=COLORS["text"],
+            command=self.toggle_hard_mode
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
         tk.Button(
             reset_frame,
             text="Reset Game",
@@ -263,7 +481,14 @@ class WordleSolverGUI:
             bg=COLORS["keyboard_key"],
             fg=COLORS["button_text"],
             command=self.reset_game
-        ).pack()
+        ).pack(side=tk.LEFT)
+    
+    def toggle_hard_mode(self):
+        if not self.ready:
+            self.load_words()
+            return
+        solver.setHardMode(self.hard_mode.get())
+        self.reset_game()
 
     def check_focus_area(self, event):
         widget = event.widget
@@ -275,7 +500,7 @@ class WordleSolverGUI:
             return "break"
         elif source == "right_panel":
             widget = event.widget
-            if widget != self.filler_entry and widget != self.filler_results:
+            if widget not in (self.filler_entry, self.filler_results, self.filler_results.text):
                 self.set_focus("game")
         
     def set_focus(self, widget_name):
@@ -288,7 +513,7 @@ class WordleSolverGUI:
         )
     
     def key_pressed(self, event):
-        if self.current_focused_widget == "filler" or self.current_row >= 6:
+        if not self.ready or self.current_focused_widget == "filler" or self.current_row >= 6:
             return
             
         key = event.char.lower()
@@ -319,20 +544,25 @@ class WordleSolverGUI:
             self.current_guesses[self.current_row][self.current_col] = " "
     
     def handle_enter(self):
+        if self.edit_pending():
+            return
+        
         if not self.guess_validated and self.current_col == 5:
             current_word = ''.join(self.current_guesses[self.current_row])
             
-            if not solver.validInput(current_word):
+            if not solver.isWord(current_word):
                 self.update_directions("That is not a valid word, Try Again!")
                 return
             
+            if not solver.isLegalGuess(current_word):
+                self.update_directions("Hard Mode: your guess must use every revealed hint, Try Again!")
+                return
+            
             self.guess_validated = True
             self.update_directions("Click on each tile to set the appropriate color (grey, yellow, green), then press RETURN/ENTER when done")
             
             for col in range(5):
-                frame, label = self.tiles[self.current_row][col]
-                frame.config(bg=COLORS["grey_tile"])
-                label.config(bg=COLORS["grey_tile"])
+                self.color_tile(self.current_row, col, 0)
                 self.position_values[self.current_row][col] = 0
                 
             return
@@ -342,18 +572,114 @@ class WordleSolverGUI:
             return
     
     def cycle_tile_color(self, row, col):
-        if row != self.current_row or not self.guess_validated:
+        # Tiles of earlier guesses can be corrected too, which refilters from that guess onward
+        editing = row < self.current_row
+        if not editing and (row != self.current_row or not self.guess_validated):
+            return
+        if self.invalid_edit and self.invalid_edit[0] != row and self.edit_pending():
             return
             
-        frame, label = self.tiles[row][col]
+        previous_values = list(self.position_values[row])
         current_value = self.position_values[row][col]
         
         new_value = (current_value + 1) % 3
         self.position_values[row][col] = new_value
-        
+        self.color_tile(row, col, new_value)
+        
+        if editing:
+            try:
+                solver.editGuess(row, self.position_values[row])
+            except ValueError as error:
+                # The solver kept the last colors that matched, the tiles keep cycling until they match again
+                if self.invalid_edit is None:
+                    self.invalid_edit = (row, previous_values)
+                self.update_directions(f"{error}. Keep fixing guess {row + 1}, or press Ctrl+Z to restore its colors")
+                return
+            self.invalid_edit = None
+            self.update_word_statistics()
+            self.update_directions(f"Updated guess {row + 1}, {len(solver.possible_words)} possible words left")
+    
+    def edit_pending(self):
+        """
+        Returns True (and says so) while an edited earlier row can't be applied.
+        """
+        if self.invalid_edit is None:
+            return False
+        self.update_directions(f"Guess {self.invalid_edit[0] + 1} can't be used with these colors, fix them or press Ctrl+Z to restore them")
+        return True
+    
+    def restore_invalid_edit(self):
+        row, position_values = self.invalid_edit
+        self.invalid_edit = None
+        self.position_values[row] = list(position_values)
+        for col in range(5):
+            self.color_tile(row, col, position_values[col])
+        self.update_directions(f"Restored the colors of guess {row + 1}")
+    
+    def color_tile(self, row, col, value):
         color_map = {0: COLORS["grey_tile"], 1: COLORS["yellow_tile"], 2: COLORS["green_tile"]}
-        frame.config(bg=color_map[new_value])
-        label.config(bg=color_map[new_value])
+        frame, label = self.tiles[row][col]
+        frame.config(bg=color_map[value])
+        label.config(bg=color_map[value])
+    
+    def clear_row(self, row):
+        self.current_guesses[row] = [" "] * 5
+        self.position_values[row] = [0] * 5
+        
+        for col in range(5):
+            frame, label = self.tiles[row][col]
+            frame.config(bg=COLORS["background"])
+            label.config(bg=COLORS["background"], text="")
+    
+    def undo_guess(self):
+        """
+        Takes back the last filtered guess (Ctrl+Z), dropping whatever was typed in the current row.
+        """
+        if not self.ready:
+            return
+        # An edit that matches no words is taken back first, the solver never applied it
+        if self.invalid_edit:
+            self.restore_invalid_edit()
+            return
+        if self.current_row == 0:
+            return
+        guess = solver.undo()
+        if guess is None:
+            return
+        
+        if self.current_row < 6:
+            self.clear_row(self.current_row)
+        self.current_row -= 1
+        self.clear_row(self.current_row)
+        self.current_col = 0
+        self.guess_validated = False
+        
+        self.update_word_statistics()
+        self.update_directions(f"Undid {guess[0].upper()}, please enter a valid word and press RETURN/ENTER")
+    
+    def redo_guess(self):
+        """
+        Filters the last guess taken back by 'undo_guess' again (Ctrl+Y or Ctrl+Shift+Z).
+        """
+        if not self.ready or self.current_row >= 6 or self.edit_pending():
+            return
+        guess = solver.redo()
+        if guess is None:
+            return
+        
+        word, position_values = guess
+        self.clear_row(self.current_row)
+        self.current_guesses[self.current_row] = list(word)
+        self.position_values[self.current_row] = list(position_values)
+        for col in range(5):
+            self.tiles[self.current_row][col][1].config(text=word[col].upper())
+            self.color_tile(self.current_row, col, position_values[col])
+        self.current_row += 1
+        self.current_col = 0
+        self.guess_validated = False
+        
+        self.update_word_statistics()
+        self.update_directions(f"Redid {word.upper()}, please enter a valid word and press RETURN/ENTER")
     
     def process_guess(self):
         current_word = ''.join(self.current_guesses[self.current_row])
@@ -367,10 +693,12 @@ class WordleSolverGUI:
             messagebox.showinfo("Solution Found", f"The answer is: {solver.possible_words[0]}")
             self.update_directions(f"Solution Found! The answer is: {solver.possible_words[0]}")
         elif len(solver.possible_words) == 0:
-            messagebox.showerror("No Solutions", "No words match your criteria. Please check your inputs.")
-            self.update_directions("No words match your criteria. Please check your inputs or reset the game.")
-            solver.reset()
+            # Take the guess back for good so its colors (or an earlier row's) can be fixed without retyping
+            solver.undo(redoable=False)
             self.update_word_statistics()
+            messagebox.showerror("No Solutions", "No words match your criteria. Please check your inputs.")
+            self.update_directions("No words match your criteria. Fix the tile colors and press RETURN/ENTER, or reset the game.")
+            return
         else:
             self.update_directions("Please enter a valid word and press RETURN/ENTER")
         
@@ -387,20 +715,32 @@ class WordleSolverGUI:
                 self.update_directions(f"Game Over! Possible answers include: {possibilities}")
     
     def update_word_statistics(self):
+        """
+        Ranks the possible words on the background thread, replacing any ranking still in progress.
+        """
         self.remaining_words_label.config(text=f"Possible Words: {len(solver.possible_words)}")
+        self.show_computing(True)
+        self.task.submit(solver.rankLater(), self.show_word_statistics, self.computing_failed)
+    
+    def show_computing(self, computing):
+        self.computing_label.config(text="computing\u2026" if computing else "")
+    
+    def computing_failed(self, error):
+        self.show_computing(False)
+        self.update_directions(f"Could not compute the best next words: {error}")
+    
+    def show_word_statistics(self, ranking):
+        self.show_computing(False)
         
-        data = solver.fetchData(solver.possible_words)
-        best_words = solver.bestNextWords(len(solver.possible_words), data)
-        
-        self.word_suggestions.config(state=tk.NORMAL)
-        self.word_suggestions.delete(1.0, tk.END)
-        
-        for i, (word, score) in enumerate(best_words):
-            self.word_suggestions.insert(tk.END, f"{i+1}. {word} (Score: {score})\n")
-        
-        self.word_suggestions.config(state=tk.DISABLED)
+        # The ranking only sorts as far as the list is scrolled
+        self.word_suggestions.show(len(ranking), lambda start, stop: [
+            f"{i+1}. {word} (Score: {score})" for i, (word, score) in enumerate(ranking.page(start, stop), start)
+        ])
     
     def search_filler_words(self):
+        if not self.ready:
+            return
+        
         letters = self.filler_entry.get().lower()
         
         if not letters.isalpha():
@@ -414,39 +754,33 @@ class WordleSolverGUI:
         
         filler_words = solver.findFillerWords(unique_letters)
         
-        self.filler_results.config(state=tk.NORMAL)
-        self.filler_results.delete(1.0, tk.END)
-        
-        self.filler_results.insert(tk.END, "No words found." if not filler_words else "\n".join(filler_words))
-        
-        self.filler_results.config(state=tk.DISABLED)
+        if filler_words:
+            self.filler_results.show(len(filler_words), lambda start, stop: filler_words[start:stop])
+        else:
+            self.filler_results.show_message("No words found.")
         
         self.set_focus("game")
     
     def reset_game(self):
+        if not self.ready:
+            return
+        
         solver.reset()
         
+        self.invalid_edit = None
         self.current_row = 0
         self.current_col = 0
         self.guess_validated = False
         
         for row in range(6):
-            self.current_guesses[row] = [" "] * 5
-            self.position_values[row] = [0] * 5
-            
-            for col in range(5):
-                frame, label = self.tiles[row][col]
-                frame.config(bg=COLORS["background"])
-                label.config(bg=COLORS["background"], text="")
+            self.clear_row(row)
         
         self.update_word_statistics()
         
         self.update_directions("Please enter a valid word and press RETURN/ENTER")
         
         self.filler_entry.delete(0, tk.END)
-        self.filler_results.config(state=tk.NORMAL)
-        self.filler_results.delete(1.0, tk.END)
-        self.filler_results.config(state=tk.DISABLED)
+        self.filler_results.clear()
 
 if __name__ == "__main__":
     root = tk.Tk()
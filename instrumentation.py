@@ -0,0 +1,183 @@
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# Latencies kept per operation for the percentiles, older ones are dropped
+LATENCY_SAMPLES = 4096
+
+# Percentiles reported for every operation
+PERCENTILES = (50, 90, 99)
+
+class OperationStats:
+    """
+    Timings and sizes recorded for one instrumented operation.
+
+    Attributes:
+        calls (int): Number of completed calls.
+        seconds (float): Cumulative time spent in the operation.
+        latencies (collections.deque): The last 'LATENCY_SAMPLES' call durations, in seconds.
+        size_in (int): Summed input sizes (e.g. candidates before filtering) of the calls that report one.
+        size_out (int): Summed output sizes (e.g. candidates left or words returned).
+        last_size_in (int): Input size of the last call.
+        last_size_out (int): Output size of the last call.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.size_in = 0
+        self.size_out = 0
+        self.last_size_in = None
+        self.last_size_out = None
+
+    def percentiles(self):
+        if not self.latencies:
+            return {f"p{percentile}": None for percentile in PERCENTILES}
+        values = np.percentile(np.fromiter(self.latencies, dtype=float), PERCENTILES)
+        return {f"p{percentile}": float(value) for percentile, value in zip(PERCENTILES, values)}
+
+    def toDict(self):
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "mean_seconds": self.seconds / self.calls if self.calls else None,
+            "latency_seconds": self.percentiles(),
+            "size_in": self.size_in,
+            "size_out": self.size_out,
+            "last_size_in": self.last_size_in,
+            "last_size_out": self.last_size_out,
+        }
+
+class Metrics:
+    """
+    Opt-in counters for the solver's hot paths: call counts, cumulative and percentile latencies,
+    input/output sizes and cache hit rates.
+
+    Recording is off until 'enable' is called (or the WORDLE_SOLVER_METRICS environment variable is set),
+    a disabled instrumented call only costs one attribute check. Recording is thread safe.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.operations = {}
+        self.caches = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.operations = {}
+            self.caches = {}
+
+    def record(self, name, seconds, size_in=None, size_out=None):
+        with self._lock:
+            stats = self.operations.get(name)
+            if stats is None:
+                stats = self.operations[name] = OperationStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.latencies.append(seconds)
+            if size_in is not None:
+                stats.size_in += size_in
+                stats.last_size_in = size_in
+            if size_out is not None:
+                stats.size_out += size_out
+                stats.last_size_out = size_out
+
+    def countCache(self, name, hit):
+        """
+        Counts a lookup of the cache 'name' as a hit or a miss.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            counts = self.caches.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def toDict(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "operations": {name: stats.toDict() for name, stats in sorted(self.operations.items())},
+                "caches": {
+                    name: {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+                    for name, (hits, misses) in sorted(self.caches.items())
+                },
+            }
+
+    def toJSON(self, indent=None):
+        return json.dumps(self.toDict(), indent=indent)
+
+    def toPrometheus(self, prefix="wordle_solver"):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        data = self.toDict()
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{key}="{label}"' for key, label in labels.items())
+                lines.append(f"{prefix}_{name}{suffix}{{{label_text}}} {value}")
+
+        operations = data["operations"]
+        latency_samples = []
+        for operation, stats in operations.items():
+            for percentile, value in stats["latency_seconds"].items():
+                if value is not None:
+                    quantile = str(int(percentile[1:]) / 100)
+                    latency_samples.append(("", {"operation": operation, "quantile": quantile}, value))
+            latency_samples.append(("_sum", {"operation": operation}, stats["seconds"]))
+            latency_samples.append(("_count", {"operation": operation}, stats["calls"]))
+        family("latency_seconds", "summary", "Latency of solver operations (quantiles over recent calls).", latency_samples)
+        family("input_size_total", "counter", "Summed input sizes of solver operations.",
+               [("", {"operation": operation}, stats["size_in"])
+                for operation, stats in operations.items() if stats["last_size_in"] is not None])
+        family("output_size_total", "counter", "Summed output sizes of solver operations.",
+               [("", {"operation": operation}, stats["size_out"])
+                for operation, stats in operations.items() if stats["last_size_out"] is not None])
+        family("cache_hits_total", "counter", "Cache lookups answered from the cache.",
+               [("", {"cache": cache}, counts["hits"]) for cache, counts in data["caches"].items()])
+        family("cache_misses_total", "counter", "Cache lookups that had to compute or load the value.",
+               [("", {"cache": cache}, counts["misses"]) for cache, counts in data["caches"].items()])
+        return "\n".join(lines) + "\n"
+
+# Metrics recorded by every instrumented function
+metrics = Metrics(enabled=bool(os.environ.get("WORDLE_SOLVER_METRICS")))
+
+def instrumented(name, size_in=None, size_out=None):
+    """
+    Decorator recording every call of a function in 'metrics' while it is enabled.
+
+    Args:
+        name (str): Operation name the calls are recorded under.
+        size_in (callable): size_in(*args, **kwargs), called before the function, returns its input size.
+        size_out (callable): size_out(result, *args, **kwargs), called after it, returns its output size.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return function(*args, **kwargs)
+            before = size_in(*args, **kwargs) if size_in else None
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            seconds = time.perf_counter() - start
+            after = size_out(result, *args, **kwargs) if size_out else None
+            metrics.record(name, seconds, before, after)
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,196 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+import solver
+
+# Candidate set sizes every primitive is measured at, capped at the number of answers
+SIZES = (1, 10, 100, 1000, 2309)
+
+# Time spent measuring each case, and the bounds on the number of measured calls
+CASE_SECONDS = 0.3
+MIN_CALLS = 10
+MAX_CALLS = 2000
+
+# A case is a regression when it is this much slower than the baseline (0.2 = 20%)
+DEFAULT_THRESHOLD = 0.2
+
+def measure(setup, run):
+    """
+    Times 'run(*setup())' call by call, with 'setup' excluded from the timings.
+
+    Calls are repeated until 'CASE_SECONDS' have been spent (within 'MIN_CALLS' and 'MAX_CALLS').
+
+    Returns:
+        dict: Median, minimum and 90th percentile seconds per call, and the number of calls timed.
+    """
+    timings = []
+    deadline = time.perf_counter() + CASE_SECONDS
+    while len(timings) < MIN_CALLS or (len(timings) < MAX_CALLS and time.perf_counter() < deadline):
+        args = setup()
+        start = time.perf_counter()
+        run(*args)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings)
+    return {
+        "median": float(np.median(timings)),
+        "min": float(timings.min()),
+        "p90": float(np.percentile(timings, 90)),
+        "calls": len(timings),
+    }
+
+def repeatedLetterWords(corpus):
+    return [word for word in corpus.all_inputs if len(set(word)) < 5]
+
+def runSuite(file_path="all-answers.csv", seed=0, sizes=SIZES):
+    """
+    Measures the solver primitives on seeded samples of candidate sets.
+
+    For every size a candidate set is sampled from the answers and an answer from the candidate set.
+    Guesses alternate between random inputs and inputs with repeated letters (e.g. 'geese', 'llama'),
+    their feedback against the answer is what 'filterWords' is measured with.
+
+    Args:
+        file_path (str): The answers CSV.
+        seed (int): Seed of every random choice, the same seed measures the same inputs.
+        sizes (tuple[int]): Candidate set sizes to measure.
+
+    Returns:
+        dict: The results, keyed by '<primitive>/<size>', and the environment they were measured in.
+    """
+    corpus = solver.loadCorpus(file_path)
+    corpus.patternMatrix()
+    repeated = repeatedLetterWords(corpus)
+    results = {}
+
+    for size in sizes:
+        size = min(size, len(corpus.all_words))
+        rng = random.Random(f"{seed}-{size}")
+        candidates = sorted(rng.sample(corpus.all_words, size), key=corpus.word_index.get)
+        answer = rng.choice(candidates)
+        guesses = [rng.choice(repeated if i % 2 else corpus.all_inputs) for i in range(16)]
+        feedback = [(guess, solver.computePattern(guess, answer)) for guess in guesses]
+        data = solver.fetchData(candidates)
+        session = solver.SolverSession(corpus)
+        stats = solver.LetterStats.fromWords(candidates)
+
+        def sessionWith(words):
+            session.possible_words = list(words)
+            session.history = []
+            session.snapshots = []
+            session.stats = stats.copy()
+            session._data = None
+            return session
+
+        turns = iter(range(sys.maxsize))
+
+        def filterSetup():
+            guess, positionValues = feedback[next(turns) % len(feedback)]
+            return sessionWith(candidates), guess, positionValues
+
+        results[f"filterWords/{size}"] = measure(filterSetup, lambda current, guess, values: current.filterWords(guess, values))
+        results[f"fetchData/{size}"] = measure(lambda: (candidates,), solver.fetchData)
+        results[f"wordScore/{size}"] = measure(
+            lambda: (candidates, data),
+            lambda words, data: [solver.wordScore(word, data) for word in words]
+        )
+        # Ranked by the scorer directly, 'bestNextWords' would read the opening book when there is one
+        for mode in ("occurrences", "entropy"):
+            scorer = solver.findScorer(mode)
+            results[f"bestNextWords[{mode}]/{size}"] = measure(
+                lambda: (candidates,),
+                lambda words: scorer.rank(corpus, words, data, 10)
+            )
+
+        # Filler searches vary a lot with the letters, so every timed call runs the same 16 searches
+        letter_sets = ["".join(rng.sample(solver.ALPHABET, rng.randint(1, 3))) for _ in range(16)]
+        results[f"findFillerWords/{size}"] = measure(
+            lambda: (sessionWith(candidates),),
+            lambda current: [current.findFillerWords(letters, rank=True) for letters in letter_sets]
+        )
+
+        # Half valid inputs, half misspelled ones
+        inputs = [word if i % 2 else word[::-1] + "x" for i, word in enumerate(rng.choices(corpus.all_inputs, k=size))]
+        results[f"validInput/{size}"] = measure(
+            lambda: (inputs,),
+            lambda words: [corpus.validInput(word) for word in words]
+        )
+
+    return {
+        "meta": {
+            "seed": seed,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compareResults(current, baseline, threshold=DEFAULT_THRESHOLD, statistic="median"):
+    """
+    Compares 'statistic' ('median', 'min' or 'p90') of every case measured in both runs. The minimum
+    is the least affected by other load on the machine.
+
+    Returns:
+        list: (case, baseline seconds, current seconds, ratio, regressed) for every shared case.
+    """
+    rows = []
+    for case, result in current["results"].items():
+        if case not in baseline["results"]:
+            continue
+        before = baseline["results"][case][statistic]
+        ratio = result[statistic] / before if before else float("inf")
+        rows.append((case, before, result[statistic], ratio, ratio > 1 + threshold))
+    return rows
+
+def printResults(report):
+    print(f"{'case':<32}{'median':>12}{'min':>12}{'p90':>12}{'calls':>8}")
+    for case, result in report["results"].items():
+        print(f"{case:<32}{result['median'] * 1e6:>10.1f}us{result['min'] * 1e6:>10.1f}us{result['p90'] * 1e6:>10.1f}us{result['calls']:>8}")
+
+def printComparison(rows, threshold):
+    print(f"\n{'case':<32}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for case, before, after, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{case:<32}{before * 1e6:>10.1f}us{after * 1e6:>10.1f}us{ratio:>8.2f}{flag}")
+    regressions = sum(regressed for *_, regressed in rows)
+    print(f"\n{regressions} of {len(rows)} cases more than {threshold * 100:.0f}% slower than the baseline")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the solver primitives across candidate set sizes.")
+    parser.add_argument("--answers", default="all-answers.csv", help="answers CSV")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the sampled candidate sets and guesses")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="candidate set sizes")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fraction a case may be slower than the baseline before it counts as a regression")
+    parser.add_argument("--statistic", choices=("median", "min", "p90"), default="median",
+                        help="per-call timing compared against the baseline")
+    args = parser.parse_args()
+
+    report = runSuite(args.answers, args.seed, tuple(args.sizes))
+    printResults(report)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["meta"].get("seed") != args.seed:
+            print(f"\nWarning: the baseline was measured with seed {baseline['meta'].get('seed')}")
+        rows = compareResults(report, baseline, args.threshold, args.statistic)
+        printComparison(rows, args.threshold)
+        if any(regressed for *_, regressed in rows):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import sys
+
+import numpy as np
+
+import solver
+
+# Guesses stored per ranking, enough for the suggestion lists of the GUI and the server
+DEFAULT_COUNT = 50
+
+def bookEntry(candidates, ranked):
+    return {
+        "remaining": len(candidates),
+        "ranked": [[word, score.item() if isinstance(score, np.generic) else score] for word, score in ranked],
+    }
+
+def buildOpeningBook(corpus, modes=("occurrences",), openers=None, count=DEFAULT_COUNT):
+    """
+    Ranks the first guess, and the second guess after every feedback to each opener, for every mode.
+
+    Args:
+        corpus (solver.WordCorpus): The word lists to build the book from.
+        modes (tuple[str]): The 'bestNextWords' ranking modes to store.
+        openers (list[str]): First guesses to store second guesses for. Each mode's own best first guess
+                             is always added.
+        count (int): Number of guesses stored per ranking.
+
+    Returns:
+        solver.OpeningBook: The finished book.
+    """
+    matrix = corpus.patternMatrix()
+    columns = np.arange(len(corpus.all_words))
+    strategies = {}
+
+    # Ranked by the scorers directly, 'bestNextWords' would read an existing book
+    def rank(candidates, mode):
+        data = solver.fetchData(candidates) if mode == "occurrences" else None
+        return bookEntry(candidates, solver.findScorer(mode).rank(corpus, candidates, data, count))
+
+    for mode in modes:
+        name = solver.findScorer(mode).name
+        first = rank(list(corpus.all_words), mode)
+        second = {}
+        for opener in dict.fromkeys([first["ranked"][0][0], *(openers or [])]):
+            feedback = matrix[corpus.input_index[opener], columns]
+            buckets = {}
+            for pattern in np.unique(feedback):
+                if pattern == solver.NUM_PATTERNS - 1:
+                    continue
+                bucket = [corpus.all_words[i] for i in np.flatnonzero(feedback == pattern)]
+                buckets[str(int(pattern))] = rank(bucket, mode)
+            second[opener] = buckets
+        strategies[name] = {"first": first, "openers": second}
+
+    return solver.OpeningBook(corpus.digest(), count, strategies)
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds the opening book of the first two turns.")
+    parser.add_argument("--answers", default="all-answers.csv", help="answers CSV")
+    parser.add_argument("--modes", nargs="+", default=["occurrences"], help="bestNextWords ranking modes")
+    parser.add_argument("--opener", action="append", default=[],
+                        help="also store second guesses for this first guess (repeatable)")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="guesses stored per ranking")
+    parser.add_argument("--output", help="output file (default: opening-book-<words hash>.json next to the answers)")
+    args = parser.parse_args()
+
+    corpus = solver.loadCorpus(args.answers)
+    for opener in args.opener:
+        if not corpus.validInput(opener) or opener == "filler":
+            sys.exit(f"Invalid opener: {opener}")
+    for mode in args.modes:
+        if mode not in solver.SCORERS:
+            sys.exit(f"Unknown ranking mode: {mode}")
+
+    book = buildOpeningBook(corpus, tuple(args.modes), args.opener, args.count)
+    output = args.output or corpus.openingBookPath()
+    book.save(output)
+    for mode, strategy in book.strategies.items():
+        openers = ", ".join(f"{opener} ({len(buckets)} patterns)" for opener, buckets in strategy["openers"].items())
+        print(f"{mode}: first guess {strategy['first']['ranked'][0][0]}, second guesses after {openers}")
+    print(f"Saved to {output}")
+
+if __name__ == "__main__":
+    main()
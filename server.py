@@ -0,0 +1,297 @@
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import solver
+from instrumentation import metrics
+
+# Games that received no request for this many seconds are dropped
+IDLE_TIMEOUT = 30 * 60
+
+# How often idle games are looked for
+EVICTION_INTERVAL = 60
+
+# Largest request body that is accepted
+MAX_BODY = 64 * 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class Game:
+    """
+    A game kept in memory by the server. The lock keeps requests for the same game in order,
+    requests for different games run concurrently.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+def parseBody(body):
+    """
+    Parses a request body as a JSON object, an empty body is an empty object.
+    """
+    request = json.loads(body or b"{}")
+    if not isinstance(request, dict):
+        raise HTTPError(400, "request body must be a JSON object")
+    return request
+
+def parsePattern(pattern):
+    """
+    Accepts position values as a string ('12000') or a list ([1, 2, 0, 0, 0]) and returns them as a list of ints.
+    """
+    try:
+        return solver.parsePositionValues(pattern)
+    except ValueError:
+        raise HTTPError(400, "pattern must be 5 position values from 0 to 2")
+
+class WordleServer:
+    """
+    Asyncio HTTP/JSON front end for the solver, serving any number of games from one process.
+
+    Endpoints:
+        POST   /games                          Starts a game, {"hard_mode": true} for hard mode.
+        DELETE /games/<id>                     Ends a game.
+        POST   /games/<id>/guesses             Submits {"word": ..., "pattern": "01200"}.
+        GET    /games/<id>/suggestions         Best next words, ?count=10&mode=occurrences&threshold=3.5.
+        GET    /games/<id>/fillers             Filler words for the game, ?letters=ab&rank=1.
+        GET    /games/<id>/stats               Letter statistics of the remaining words.
+        GET    /fillers                        Filler words, ?letters=ab.
+        GET    /stats                          Server counters.
+        GET    /metrics                        Solver instrumentation in Prometheus text format, ?format=json for JSON.
+
+    Filtering and ranking run in a thread pool so the event loop keeps serving other requests.
+    """
+
+    def __init__(self, file_path="all-answers.csv", workers=None, idle_timeout=IDLE_TIMEOUT):
+        self.corpus = solver.loadCorpus(file_path)
+        self.executor = ThreadPoolExecutor(workers)
+        self.idle_timeout = idle_timeout
+        self.games = {}
+        self.requests = 0
+        self.evicted = 0
+        self.started = time.monotonic()
+        self._server = None
+        self._eviction_task = None
+        self._connections = set()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """
+        Starts listening, port 0 picks a free port. Returns the (host, port) actually bound.
+        """
+        self._server = await asyncio.start_server(self.handleConnection, host, port)
+        self._eviction_task = asyncio.create_task(self.evictIdleGames())
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self._eviction_task:
+            self._eviction_task.cancel()
+        if self._server:
+            self._server.close()
+            # Closing the open connections ends their handlers, which wait_closed waits for
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def evictIdleGames(self):
+        while True:
+            await asyncio.sleep(EVICTION_INTERVAL)
+            cutoff = time.monotonic() - self.idle_timeout
+            for game_id in [game_id for game_id, game in self.games.items() if game.last_used < cutoff]:
+                del self.games[game_id]
+                self.evicted += 1
+
+    async def run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def handleConnection(self, reader, writer):
+        """
+        Serves HTTP/1.1 requests on one connection until the client closes it or asks to.
+        """
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY:
+                        raise HTTPError(413, "request body too large")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": error.message}
+                except ValueError:
+                    status, payload = 400, {"error": "malformed request"}
+                except Exception as error:
+                    status, payload = 500, {"error": str(error)}
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                # Handlers return text (e.g. Prometheus metrics) as a str, anything else is sent as JSON
+                if isinstance(payload, str):
+                    content_type, content = "text/plain; version=0.0.4", payload.encode("utf-8")
+                else:
+                    content_type, content = "application/json", json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(content)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def dispatch(self, method, target, body):
+        """
+        Routes a request to its handler. Returns (status, JSON payload).
+        """
+        self.requests += 1
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+
+        if parts == ["stats"] and method == "GET":
+            return 200, self.serverStats()
+        if parts == ["metrics"] and method == "GET":
+            return 200, metrics.toDict() if query.get("format") == "json" else metrics.toPrometheus()
+        if parts == ["fillers"] and method == "GET":
+            fillers = await self.run(self.corpus.findFillerWords, self.queryLetters(query))
+            return 200, {"fillers": fillers}
+        if parts == ["games"] and method == "POST":
+            hard_mode = parseBody(body).get("hard_mode", False)
+            if not isinstance(hard_mode, bool):
+                raise HTTPError(400, "hard_mode must be true or false")
+            game_id = uuid.uuid4().hex
+            self.games[game_id] = Game(solver.SolverSession(self.corpus, hard_mode))
+            return 201, {"game_id": game_id, "remaining": len(self.corpus.all_words), "hard_mode": hard_mode}
+        if len(parts) >= 2 and parts[0] == "games":
+            game = self.games.get(parts[1])
+            if game is None:
+                raise HTTPError(404, "unknown game")
+            game.last_used = time.monotonic()
+            action = parts[2] if len(parts) == 3 else None
+            if len(parts) > 3:
+                raise HTTPError(404, "unknown endpoint")
+            async with game.lock:
+                return await self.dispatchGame(method, parts[1], game, action, query, body)
+
+        raise HTTPError(404, "unknown endpoint")
+
+    async def dispatchGame(self, method, game_id, game, action, query, body):
+        session = game.session
+
+        if action is None and method == "DELETE":
+            del self.games[game_id]
+            return 200, {"game_id": game_id}
+        if action == "guesses" and method == "POST":
+            request = parseBody(body)
+            word = str(request.get("word", "")).strip().lower()
+            if not self.corpus.isWord(word):
+                raise HTTPError(400, f"invalid word: {word}")
+            if not session.isLegalGuess(word):
+                raise HTTPError(400, f"hard mode: {word} does not use every revealed hint")
+            await self.run(session.filterWords, word, parsePattern(request.get("pattern")))
+            return 200, self.gameState(session)
+        if action == "suggestions" and method == "GET":
+            count = int(query.get("count", 10))
+            mode = query.get("mode", "occurrences")
+            if mode not in solver.SCORERS:
+                raise HTTPError(400, f"unknown mode: {mode}")
+            threshold = float(query["threshold"]) if "threshold" in query else None
+            suggestions = await self.run(session.bestNextWords, count, session.currentData(), mode, threshold)
+            return 200, {"suggestions": suggestions, **self.gameState(session)}
+        if action == "fillers" and method == "GET":
+            rank = query.get("rank", "0") not in ("0", "false", "")
+            fillers = await self.run(session.findFillerWords, self.queryLetters(query), None, rank)
+            return 200, {"fillers": fillers}
+        if action == "stats" and method == "GET":
+            return 200, {"stats": session.currentData(), **self.gameState(session)}
+        if action in (None, "guesses", "suggestions", "fillers", "stats"):
+            raise HTTPError(405, "method not allowed")
+        raise HTTPError(404, "unknown endpoint")
+
+    @staticmethod
+    def queryLetters(query):
+        letters = query.get("letters", "").lower()
+        if not letters.isalpha() or not letters.isascii():
+            raise HTTPError(400, "letters must only contain letters")
+        return letters
+
+    @staticmethod
+    def gameState(session):
+        state = {"remaining": len(session.possible_words)}
+        if len(session.possible_words) == 1:
+            state["answer"] = session.possible_words[0]
+        return state
+
+    def serverStats(self):
+        return {
+            "games": len(self.games),
+            "requests": self.requests,
+            "evicted": self.evicted,
+            "uptime": time.monotonic() - self.started,
+        }
+
+async def serve(host, port, file_path, workers):
+    server = WordleServer(file_path, workers)
+    bound_host, bound_port = await server.start(host, port)
+    print(f"Serving on http://{bound_host}:{bound_port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the solver over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--answers", default="all-answers.csv", help="answers CSV")
+    parser.add_argument("--workers", type=int, help="threads used for filtering and ranking")
+    parser.add_argument("--metrics", action="store_true", help="record solver instrumentation, served at /metrics")
+    args = parser.parse_args()
+
+    if args.metrics:
+        metrics.enable()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.answers, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,128 @@
+import argparse
+import concurrent.futures
 import csv
+import hashlib
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
 
-# All possible words, it should eventually be reduced to a list of length 1, which should be the word that is the answer
-possible_words = []
+import numpy as np
 
-# All original possible words
-all_words = []
+from instrumentation import instrumented, metrics
 
-# All possible inputs
-all_inputs = []
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
 
-def fetchWords(file_path):
+# Typed instead of a guess to search for filler words
+FILLER_KEYWORD = "filler"
+
+# Number of distinct feedback patterns (3 colors ** 5 positions)
+NUM_PATTERNS = 243
+
+# Candidate lists up to this size are scored by sorting patterns instead of histogramming all 243 buckets
+SMALL_CANDIDATE_SET = 32
+
+def encodePattern(positionValues):
     """
-    Loads all words from a CSV file into the global 'all_words' and 'possible_words' lists.
-    
-    Reads the file, assumes each word is in a new row, and populates both lists with these entries.
+    Encodes a list of 5 position values (0 grey, 1 yellow, 2 green) as a single pattern id.
+
+    Position i contributes positionValues[i] * 3**i, so ids range from 0 (all grey) to 242 (all green).
     """
-    global all_words, possible_words, all_inputs
+    return sum(value * 3 ** i for i, value in enumerate(positionValues))
 
-    with open(file_path, mode='r', newline='') as file:
-        csv_reader = csv.reader(file)
-        all_words = [row[0] for row in csv_reader]
-        possible_words = all_words.copy()
-    
-    with open("all-inputs.csv", mode='r', newline='') as file:
-        csv_reader = csv.reader(file)
-        all_inputs = [row[0] for row in csv_reader]
+def decodePattern(pattern):
+    """
+    Decodes a pattern id created by 'encodePattern' back into a list of 5 position values.
+    """
+    positionValues = []
+    for _ in range(5):
+        positionValues.append(pattern % 3)
+        pattern //= 3
+    return positionValues
+
+def computePattern(guess, answer):
+    """
+    Computes the feedback Wordle would show for a guess against an answer.
+
+    Greens are assigned first, then yellows from left to right while the answer still has
+    unmatched copies of the letter, so repeated letters are colored the same way Wordle does.
+
+    Args:
+        guess (str): The guessed word.
+        answer (str): The answer word.
+
+    Returns:
+        list[int]: Position values (0 grey, 1 yellow, 2 green) like the ones passed to 'filterWords'.
+    """
+    positionValues = [0] * 5
+    remaining = {}
+    for i in range(5):
+        if guess[i] == answer[i]:
+            positionValues[i] = 2
+        else:
+            remaining[answer[i]] = remaining.get(answer[i], 0) + 1
+    for i in range(5):
+        if positionValues[i] == 0 and remaining.get(guess[i], 0) > 0:
+            positionValues[i] = 1
+            remaining[guess[i]] -= 1
+    return positionValues
+
+def wordsToArray(words):
+    """
+    Converts a list of 5 letter words into a (len(words), 5) uint8 array of letter indices (a = 0).
+    """
+    if not words:
+        return np.zeros((0, 5), dtype=np.uint8)
+    return (np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8) - ord("a")).reshape(-1, 5)
+
+def buildPatternMatrix(guesses, answers, chunk_size=512):
+    """
+    Computes the pattern id of every guess against every answer.
+
+    A non-green letter is yellow when the answer has more unmatched copies of it than the
+    guess has already used in earlier non-green positions, which matches 'computePattern'.
+
+    Args:
+        guesses (list[str]): Words guessed (matrix rows).
+        answers (list[str]): Possible answers (matrix columns).
+        chunk_size (int): Number of guesses processed per vectorized step.
+
+    Returns:
+        numpy.ndarray: A (len(guesses), len(answers)) uint8 matrix of pattern ids.
+    """
+    guess_letters = wordsToArray(guesses)
+    answer_letters = wordsToArray(answers)
+    powers = 3 ** np.arange(5, dtype=np.uint8)
+    matrix = np.empty((len(guesses), len(answers)), dtype=np.uint8)
+
+    for start in range(0, len(guesses), chunk_size):
+        chunk = guess_letters[start:start + chunk_size]
+        greens = chunk[:, None, :] == answer_letters[None, :, :]
+        values = greens.astype(np.uint8) * 2
+
+        for i in range(5):
+            letter = chunk[:, i, None]
+            # Copies of the letter left in the answer after greens...
+            unmatched = np.zeros((len(chunk), len(answers)), dtype=np.uint8)
+            for k in range(5):
+                unmatched += (answer_letters[None, :, k] == letter) & ~greens[:, :, k]
+            # ...minus the ones already used by earlier non-green copies in the guess
+            used = np.zeros_like(unmatched)
+            for j in range(i):
+                used += (chunk[:, j, None] == letter) & ~greens[:, :, j]
+            values[:, :, i] += ~greens[:, :, i] & (unmatched > used)
 
+        matrix[start:start + chunk_size] = values @ powers
+
+    return matrix
+
+@instrumented("fetchData", size_in=lambda localWords: len(localWords))
 def fetchData(localWords):
     """
     Analyzes letter statistics for a given list of words.
@@ -39,27 +136,56 @@ def fetchData(localWords):
             - 'frequencies': Total occurrences of each letter across all positions.
             - 'positions': Positional frequency of each letter.
     """
-    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    return LetterStats.fromWords(localWords).toDict()
 
-    occurrences = {letter: 0 for letter in alphabet}
-    frequencies = {letter: 0 for letter in alphabet}
-    positions = {letter: [0] * 5 for letter in alphabet}
+class LetterStats:
+    """
+    Letter statistics of a list of words, kept as arrays so they can be built with bincount and
+    updated by subtracting the statistics of removed words instead of being recomputed.
 
-    for word in localWords:
-        searched_letters = []
-        for index, letter in enumerate(word):
-            if letter in alphabet:
-                frequencies[letter] += 1
-                positions[letter][index] += 1
-                if letter not in searched_letters:
-                    occurrences[letter] += 1
-                    searched_letters.append(letter)
+    Attributes:
+        occurrences (numpy.ndarray): Number of words containing each letter, shape (26,).
+        frequencies (numpy.ndarray): Total occurrences of each letter across all positions, shape (26,).
+        positions (numpy.ndarray): Occurrences of each letter at each position, shape (26, 5).
+    """
 
-    return {
-        "occurrences": occurrences,
-        "frequencies": frequencies,
-        "positions": positions
-    }
+    def __init__(self, occurrences, frequencies, positions):
+        self.occurrences = occurrences
+        self.frequencies = frequencies
+        self.positions = positions
+
+    @classmethod
+    def fromWords(cls, words):
+        letters = wordsToArray(words)
+        # Letter ids shifted by position so one bincount fills the whole (5, 26) table
+        positions = np.bincount((letters + np.arange(5) * 26).ravel(), minlength=5 * 26).reshape(5, 26).T
+        present = np.zeros((len(words), 26), dtype=bool)
+        present[np.arange(len(words))[:, None], letters] = True
+        return cls(present.sum(axis=0), positions.sum(axis=1), positions)
+
+    def copy(self):
+        return LetterStats(self.occurrences.copy(), self.frequencies.copy(), self.positions.copy())
+
+    def remove(self, words):
+        """
+        Subtracts the statistics of 'words', which must all be part of the words these statistics describe.
+        """
+        if words:
+            removed = LetterStats.fromWords(words)
+            self.occurrences -= removed.occurrences
+            self.frequencies -= removed.frequencies
+            self.positions -= removed.positions
+        return self
+
+    def toDict(self):
+        """
+        Returns the statistics in the same format as 'fetchData'.
+        """
+        return {
+            "occurrences": dict(zip(ALPHABET, self.occurrences.tolist())),
+            "frequencies": dict(zip(ALPHABET, self.frequencies.tolist())),
+            "positions": dict(zip(ALPHABET, self.positions.tolist()))
+        }
 
 def letterCount(word, letter):
     """
@@ -74,48 +200,111 @@ def letterCount(word, letter):
     """
     return word.count(letter)
 
-def filterWords(word, positionValues):
+class Constraints:
     """
-    Filters the global 'possible_words' list based on the provided word and positional hints.
-    
-    Args:
-        word (str): The word used for filtering.
-        positionValues (list[int]): List of positional hints (length 5):
-            - 0: The letter is not in the answer.
-            - 1: The letter is in the answer but not in the correct position.
-            - 2: The letter is in the correct position.
+    Everything a set of feedback rows says about the answer, compiled so candidates can be checked in one pass.
+
+    Attributes:
+        allowed (list[set[str]]): Letters that may still appear at each of the 5 positions.
+        min_counts (dict): Letter -> minimum number of times it must appear in the answer.
+        max_counts (dict): Letter -> maximum number of times it can appear in the answer.
     """
-    global possible_words
 
-    for i in range(5):
-        letter = word[i]
-        if positionValues[i] == 0:
-            # Grey Square - Exclude words containing the letter
-            # Only exclude if the letter is not present in other positions with value 1 or 2
-            if letter not in [word[j] for j in range(5) if positionValues[j] in (1, 2)]:
-                possible_words = list(filter(lambda current_word: letter not in current_word, possible_words))
-        elif positionValues[i] == 1:
-            # Yellow Square - Include words with the letter but not at the specific position
-            possible_words = list(filter(
-                lambda current_word: (
-                    letter in current_word and
-                    letter != current_word[i]
-                ),
-                possible_words
-            ))
-        elif positionValues[i] == 2:
-            # Green Square - Include words with the letter at the specific position
-            possible_words = list(filter(lambda current_word: letter == current_word[i], possible_words))
-
-    # Additional filtering to handle multiple occurrences of the same letter
-    for letter in set(word):
-        # Count the number of times the letter appears in the word with position values 1 or 2
-        required_count = sum(1 for i in range(5) if word[i] == letter and positionValues[i] in (1, 2))
-        if required_count > 0:
-            possible_words = list(filter(
-                lambda current_word: current_word.count(letter) >= required_count,
-                possible_words
-            ))
+    def __init__(self):
+        self.allowed = [set(ALPHABET) for _ in range(5)]
+        self.min_counts = {}
+        self.max_counts = {}
+
+    @classmethod
+    def fromFeedback(cls, word, positionValues):
+        """
+        Compiles a single guess and its position values (see 'filterWords') into constraints.
+        """
+        constraints = cls()
+        constraints.add(word, positionValues)
+        return constraints
+
+    @classmethod
+    def hardModeRules(cls, word, positionValues):
+        """
+        Compiles the hard mode rules revealed by a guess: green letters must stay in place and yellow
+        letters must be reused. Unlike 'fromFeedback', grey letters and yellow positions stay allowed.
+        """
+        constraints = cls()
+        for i in range(5):
+            if positionValues[i] == 2:
+                constraints.allowed[i] = {word[i]}
+        for letter in set(word):
+            marked = sum(1 for i in range(5) if word[i] == letter and positionValues[i] in (1, 2))
+            if marked:
+                constraints.min_counts[letter] = marked
+        return constraints
+
+    def add(self, word, positionValues):
+        """
+        Narrows these constraints with another guess and its position values.
+
+        A grey letter caps the letter count at the number of yellow/green copies in the same guess,
+        so repeated letters are handled without a separate pass.
+        """
+        for i in range(5):
+            if positionValues[i] == 2:
+                self.allowed[i] &= {word[i]}
+            else:
+                self.allowed[i].discard(word[i])
+
+        for letter in set(word):
+            marked = sum(1 for i in range(5) if word[i] == letter and positionValues[i] in (1, 2))
+            if marked > self.min_counts.get(letter, 0):
+                self.min_counts[letter] = marked
+            if any(word[i] == letter and positionValues[i] == 0 for i in range(5)):
+                self.max_counts[letter] = min(marked, self.max_counts.get(letter, 5))
+        return self
+
+    def combine(self, other):
+        """
+        Returns new constraints that hold only for words matching both 'self' and 'other'.
+        """
+        combined = Constraints()
+        combined.allowed = [mine & theirs for mine, theirs in zip(self.allowed, other.allowed)]
+        combined.min_counts = dict(self.min_counts)
+        for letter, count in other.min_counts.items():
+            combined.min_counts[letter] = max(count, combined.min_counts.get(letter, 0))
+        combined.max_counts = dict(self.max_counts)
+        for letter, count in other.max_counts.items():
+            combined.max_counts[letter] = min(count, combined.max_counts.get(letter, 5))
+        return combined
+
+    def matches(self, word):
+        """
+        Returns True if 'word' could be the answer under these constraints.
+        """
+        for i in range(5):
+            if word[i] not in self.allowed[i]:
+                return False
+        for letter, count in self.min_counts.items():
+            if word.count(letter) < count:
+                return False
+        for letter, count in self.max_counts.items():
+            if word.count(letter) > count:
+                return False
+        return True
+
+    def apply(self, words):
+        """
+        Returns the words that match these constraints, keeping their order.
+        """
+        return [word for word in words if self.matches(word)]
+
+    def partition(self, words):
+        """
+        Splits 'words' into (matching, not matching) lists, keeping their order.
+        """
+        matching = []
+        rejected = []
+        for word in words:
+            (matching if self.matches(word) else rejected).append(word)
+        return matching, rejected
 
 def wordScore(word, data):
     """
@@ -137,80 +326,1614 @@ def wordScore(word, data):
             lettersChecked.append(letter)
     return [word, score]
 
-def bestNextWords(numWords, data):
-    scored_words = [wordScore(word, data) for word in possible_words]
-    scored_words.sort(key = lambda x: x[1], reverse=True)
-    bestWords = scored_words[:numWords]
-    return bestWords
+# Packed corpus file layout: a header followed by fixed 5 byte records, first every answer, then every input
+PACKED_MAGIC = b"WRDL"
+PACKED_VERSION = 1
+# magic, version, answer count, input count, size and mtime of both CSVs, sha1 of both word lists
+PACKED_HEADER = struct.Struct("<4sHxxIIqqqq40s")
+
+def readWordList(file_path):
+    with open(file_path, mode='r', newline='') as file:
+        csv_reader = csv.reader(file)
+        return [row[0] for row in csv_reader]
+
+def contentHash(all_words, all_inputs):
+    return hashlib.sha1("\n".join(tuple(all_inputs) + ("|",) + tuple(all_words)).encode("ascii")).hexdigest()
 
-def findFillerWords(letters):
+def sourceStamp(file_path, inputs_path):
     """
-    Finds words that contain all specified letters.
-    
+    Returns (size, mtime) of both CSVs, a packed corpus with a different stamp is out of date.
+    """
+    answers = os.stat(file_path)
+    inputs = os.stat(inputs_path)
+    return (answers.st_size, answers.st_mtime_ns, inputs.st_size, inputs.st_mtime_ns)
+
+def packedCorpusPath(file_path):
+    return os.path.splitext(os.path.abspath(file_path))[0] + ".corpus"
+
+def writeAtomically(path, write):
+    """
+    Calls write(file) on a temporary file next to 'path' and moves it into place once it is complete,
+    so other processes never see a partially written file.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write(file)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def packCorpus(file_path, inputs_path, output_path):
+    """
+    Converts the answers CSV and inputs CSV into one packed corpus file.
+
     Args:
-        letters (str): A string of letters to search for.
-    
-    Returns:
-        list: A list of words from 'all_words' that contain all the specified letters.
-    
-    Example:
-        letters = "abc"
-        Returns all words that contain 'a', 'b', and 'c'.
+        file_path (str): The answers CSV.
+        inputs_path (str): The inputs CSV.
+        output_path (str): Where to write the packed corpus.
+    """
+    stamp = sourceStamp(file_path, inputs_path)
+    all_words = readWordList(file_path)
+    all_inputs = readWordList(inputs_path)
+    header = PACKED_HEADER.pack(
+        PACKED_MAGIC, PACKED_VERSION, len(all_words), len(all_inputs), *stamp,
+        contentHash(all_words, all_inputs).encode("ascii")
+    )
+    records = "".join(all_words + all_inputs).encode("ascii")
+    writeAtomically(output_path, lambda file: file.write(header + records))
+
+def readPackedHeader(path):
+    """
+    Returns the header of a packed corpus file as a dict, or None if the file is missing or not a packed corpus.
+    """
+    try:
+        with open(path, mode='rb') as file:
+            raw = file.read(PACKED_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(raw) < PACKED_HEADER.size:
+        return None
+    magic, version, num_words, num_inputs, *stamp, digest = PACKED_HEADER.unpack(raw)
+    if magic != PACKED_MAGIC or version != PACKED_VERSION:
+        return None
+    return {
+        "num_words": num_words,
+        "num_inputs": num_inputs,
+        "sources": tuple(stamp),
+        "digest": digest.decode("ascii"),
+    }
+
+def loadPackedCorpus(path):
+    """
+    Memory-maps a packed corpus file and returns its 'WordCorpus'.
+
+    The records are decoded as one block and cut at fixed 5 byte offsets, nothing is parsed per word.
+    """
+    with open(path, mode='rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        magic, version, num_words, num_inputs, *_, digest = PACKED_HEADER.unpack_from(mapped)
+        if magic != PACKED_MAGIC or version != PACKED_VERSION:
+            raise ValueError(f"{path} is not a packed word corpus")
+        records = mapped[PACKED_HEADER.size:PACKED_HEADER.size + 5 * (num_words + num_inputs)].decode("ascii")
+
+    words = [records[i:i + 5] for i in range(0, len(records), 5)]
+    return WordCorpus(words[:num_words], words[num_words:], os.path.dirname(path), digest.decode("ascii")[:12])
+
+class WordCorpus:
+    """
+    The word lists loaded from the CSVs, shared read-only by every 'SolverSession'.
+
+    Attributes:
+        all_words (tuple[str]): All original possible answers.
+        all_inputs (tuple[str]): All words that are accepted as guesses.
+        word_index (dict): Answer -> column index into the pattern matrix.
+        input_index (dict): Input -> row index into the pattern matrix.
+        input_set (frozenset): 'all_inputs' as a set for constant time word checks.
+        word_stats (LetterStats): Letter statistics of 'all_words', copied by new sessions.
+        data_dir (str): Directory of the answer CSV, the pattern matrix cache and opening book are kept there.
+        source (tuple): (answers CSV, inputs CSV) the corpus was loaded from, None if it was built in memory.
+    """
+
+    def __init__(self, all_words, all_inputs, data_dir=".", digest=None):
+        self.all_words = tuple(all_words)
+        self.all_inputs = tuple(all_inputs)
+        self.word_index = dict(zip(self.all_words, range(len(self.all_words))))
+        self.input_index = dict(zip(self.all_inputs, range(len(self.all_inputs))))
+        self.input_set = frozenset(self.all_inputs)
+        self.data_dir = data_dir
+        self.source = None
+        self.word_stats = LetterStats.fromWords(self.all_words)
+        self._pattern_matrix = None
+        self._letter_bits = None
+        self._position_bits = None
+        self._letter_presence = None
+        self._digest = digest
+        self._opening_book = None
+        self._opening_book_loaded = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fromFiles(cls, file_path, inputs_path=None):
+        """
+        Loads the answers CSV and the inputs CSV, assuming each word is in a new row.
+
+        The inputs CSV defaults to 'all-inputs.csv' next to the answers CSV. Both lists are read from
+        the packed corpus file next to the CSVs (see 'packCorpus'), which is rebuilt first whenever
+        it is missing or either CSV changed since it was written.
+        """
+        if inputs_path is None:
+            inputs_path = os.path.join(os.path.dirname(os.path.abspath(file_path)), "all-inputs.csv")
+        packed_path = packedCorpusPath(file_path)
+        header = readPackedHeader(packed_path)
+        fresh = header is not None and header["sources"] == sourceStamp(file_path, inputs_path)
+        metrics.countCache("packed_corpus", fresh)
+        if not fresh:
+            try:
+                packCorpus(file_path, inputs_path, packed_path)
+            except OSError:
+                # Read-only data directory, fall back to parsing the CSVs every time
+                packed_path = None
+        if packed_path is None:
+            corpus = cls(readWordList(file_path), readWordList(inputs_path), os.path.dirname(os.path.abspath(file_path)))
+        else:
+            corpus = loadPackedCorpus(packed_path)
+        corpus.source = (os.path.abspath(file_path), os.path.abspath(inputs_path))
+        return corpus
+
+    def digest(self):
+        """
+        Returns a short hash of both word lists, files derived from them store it to detect stale data.
+        """
+        if self._digest is None:
+            self._digest = contentHash(self.all_words, self.all_inputs)[:12]
+        return self._digest
+
+    def patternCachePath(self):
+        """
+        Returns the path of the pattern matrix cache for these word lists.
+
+        The file name contains 'digest' so a changed CSV never reuses a stale matrix.
+        """
+        return os.path.join(self.data_dir, f"pattern-matrix-{self.digest()}.npy")
+
+    def openingBookPath(self):
+        """
+        Returns the path the opening book for these word lists is loaded from, see 'OpeningBook'.
+        """
+        return os.path.join(self.data_dir, f"opening-book-{self.digest()}.json")
+
+    def openingBook(self):
+        """
+        Returns the 'OpeningBook' for these word lists, loaded from 'openingBookPath' the first time it
+        is needed, or None if there is no book (or it can't be used).
+        """
+        with self._lock:
+            if not self._opening_book_loaded:
+                self._opening_book_loaded = True
+                path = self.openingBookPath()
+                try:
+                    self._opening_book = OpeningBook.fromFile(path, self) if os.path.exists(path) else None
+                except (OSError, ValueError, KeyError):
+                    self._opening_book = None
+            metrics.countCache("opening_book", self._opening_book is not None)
+        return self._opening_book
+
+    def setOpeningBook(self, book):
+        """
+        Uses 'book' instead of the book file, None turns the opening book off.
+        """
+        with self._lock:
+            self._opening_book = book
+            self._opening_book_loaded = True
+
+    def patternMatrix(self):
+        """
+        Returns the pattern matrix for 'all_inputs' x 'all_words', loading it only once per corpus.
+
+        The matrix is memory-mapped from the cache file next to the CSVs. If the file does not
+        exist it is built and written first, through a temporary file so concurrent processes
+        never read a partially written cache.
+        """
+        with self._lock:
+            metrics.countCache("pattern_matrix", self._pattern_matrix is not None)
+            if self._pattern_matrix is None:
+                self._pattern_matrix = self._loadPatternMatrix()
+        return self._pattern_matrix
+
+    @instrumented("loadPatternMatrix")
+    def _loadPatternMatrix(self):
+        path = self.patternCachePath()
+        metrics.countCache("pattern_matrix_file", os.path.exists(path))
+        if not os.path.exists(path):
+            matrix = buildPatternMatrix(self.all_inputs, self.all_words)
+            try:
+                writeAtomically(path, lambda file: np.save(file, matrix))
+            except OSError:
+                return matrix
+        return np.load(path, mmap_mode="r")
+
+    def patternCounts(self, words, rows=None, chunk_size=1024):
+        """
+        Counts how 'words' are split into feedback buckets by every word in 'all_inputs'.
+
+        Args:
+            words (list[str]): Candidate answers, all of them must be in 'all_words'.
+            rows (numpy.ndarray): Indices of the inputs to count for, defaults to all of them.
+            chunk_size (int): Number of inputs histogrammed per bincount call.
+
+        Returns:
+            numpy.ndarray: A (len(rows), 243) array where [i, p] is the number of candidates
+                           that would show pattern p if all_inputs[rows[i]] was guessed.
+        """
+        matrix = self.patternMatrix()
+        columns = np.fromiter((self.word_index[word] for word in words), dtype=np.intp, count=len(words))
+        # The full candidate list is already in column order, so skip the column gather for it
+        all_columns = len(columns) == matrix.shape[1] and bool((columns == np.arange(len(columns))).all())
+        total_rows = len(self.all_inputs) if rows is None else len(rows)
+        counts = np.empty((total_rows, NUM_PATTERNS), dtype=np.int64)
+
+        for start in range(0, total_rows, chunk_size):
+            block = matrix[start:start + chunk_size] if rows is None else matrix[rows[start:start + chunk_size]]
+            ids = (block if all_columns else block[:, columns]).astype(np.intp)
+            size = len(ids)
+            # Shift each row into its own block of 243 ids so one bincount histograms every row
+            ids += np.arange(size, dtype=np.intp)[:, None] * NUM_PATTERNS
+            counts[start:start + size] = np.bincount(
+                ids.ravel(), minlength=size * NUM_PATTERNS
+            ).reshape(size, NUM_PATTERNS)
+
+        return counts
+
+    def entropyScores(self, words, rows=None):
+        """
+        Calculates the expected information (in bits) gained by guessing each word in 'all_inputs'.
+
+        Args:
+            words (list[str]): Candidate answers, all of them must be in 'all_words'.
+            rows (numpy.ndarray): Indices of the inputs to score, defaults to all of them.
+
+        Returns:
+            numpy.ndarray: Entropy of the feedback pattern distribution for every input in 'rows'.
+        """
+        total = len(words)
+        if total <= SMALL_CANDIDATE_SET:
+            return self._sortedEntropyScores(words, rows)
+
+        counts = self.patternCounts(words, rows).ravel()
+        # H = log2(n) - sum(c * log2(c)) / n, summed over the non-empty buckets only
+        buckets = np.flatnonzero(counts)
+        sizes = counts[buckets]
+        total_rows = len(self.all_inputs) if rows is None else len(rows)
+        weighted = np.bincount(buckets // NUM_PATTERNS, weights=sizes * np.log2(sizes), minlength=total_rows)
+        return np.log2(total) - weighted / total
+
+    def _sortedEntropyScores(self, words, rows=None):
+        """
+        Same as 'entropyScores', but sorts each input's patterns instead of histogramming them,
+        which avoids touching all 243 buckets per input when there are only a few candidates.
+        """
+        columns = [self.word_index[word] for word in words]
+        total = len(columns)
+        matrix = self.patternMatrix()
+        patterns = np.sort(matrix[:, columns] if rows is None else matrix[np.ix_(rows, columns)], axis=1)
+        positions = np.arange(total)
+        # Index where the run of equal patterns containing each element starts
+        run_start = np.zeros(patterns.shape, dtype=np.intp)
+        run_start[:, 1:] = np.where(patterns[:, 1:] != patterns[:, :-1], positions[1:], 0)
+        np.maximum.accumulate(run_start, axis=1, out=run_start)
+        # A run of c equal patterns adds up to c * log2(c), one k * log2(k) - (k-1) * log2(k-1) step per element
+        steps = np.arange(total + 1) * np.log2(np.maximum(np.arange(total + 1), 1))
+        steps[1:] -= steps[:-1].copy()
+        weighted = steps[positions - run_start + 1].sum(axis=1)
+        return np.log2(total) - weighted / total
+
+    @instrumented("corpus.findFillerWords", size_out=lambda result, *args, **kwargs: len(result))
+    def findFillerWords(self, letters, positions=None):
+        """
+        Finds words that contain all specified letters.
+
+        Args:
+            letters (str): A string of letters to search for.
+            positions (dict): Optional position -> letter requirements, e.g. {0: 's'} for words starting with 's'.
+
+        Returns:
+            list: A list of words from 'all_inputs' that contain all the specified letters.
+
+        Example:
+            letters = "abc"
+            Returns all words that contain 'a', 'b', and 'c'.
+        """
+        # No input contains anything but a-z (spaces, punctuation, accented letters)
+        if any(letter not in ALPHABET for letter in letters) or \
+                any(letter not in ALPHABET for letter in (positions or {}).values()):
+            return []
+        if self._letter_bits is None:
+            self._buildLetterIndex()
+
+        rows = [self._letter_bits[ALPHABET.index(letter)] for letter in set(letters)]
+        for position, letter in (positions or {}).items():
+            rows.append(self._position_bits[position, ALPHABET.index(letter)])
+        if not rows:
+            return list(self.all_inputs)
+
+        # AND the packed bitsets together, then turn the set bits back into input indices
+        matches = np.bitwise_and.reduce(rows, axis=0)
+        indices = np.flatnonzero(np.unpackbits(matches, count=len(self.all_inputs), bitorder="little"))
+        return [self.all_inputs[i] for i in indices]
+
+    def _buildLetterIndex(self):
+        """
+        Builds packed bitsets over 'all_inputs' indices for every letter and every letter at each position.
+        """
+        letters = wordsToArray(self.all_inputs)
+        rows = np.arange(len(letters))[:, None]
+        at_position = np.zeros((len(letters), 5, 26), dtype=bool)
+        at_position[rows, np.arange(5), letters] = True
+        self._position_bits = np.packbits(at_position.transpose(1, 2, 0), axis=2, bitorder="little")
+        self._letter_bits = np.packbits(at_position.any(axis=1).T, axis=1, bitorder="little")
+
+    def letterPresence(self):
+        """
+        Returns a (len(all_inputs), 26) 0/1 matrix marking the letters each input contains.
+        """
+        if self._letter_presence is None:
+            presence = np.zeros((len(self.all_inputs), 26), dtype=np.int64)
+            presence[np.arange(len(self.all_inputs))[:, None], wordsToArray(self.all_inputs)] = 1
+            self._letter_presence = presence
+        return self._letter_presence
+
+    def isWord(self, word):
+        """
+        Returns True if 'word' is in 'all_inputs'.
+        """
+        return word in self.input_set
+
+    def validateMany(self, words):
+        """
+        Checks a batch of words against 'all_inputs'.
+
+        Args:
+            words (iterable[str]): Words to check.
+
+        Returns:
+            list[bool]: True for every word that is in 'all_inputs'.
+        """
+        return list(map(self.input_set.__contains__, words))
+
+    def validInput(self, input):
+        """
+        Returns True if input is a word in all_inputs and if the word is 'filler'
+        Returns False if input is not found in all_inputs
+
+        Args:
+            input (str): Represents what the user inputted as their word
+
+        Returns:
+            bool: True if input is a valid word and False if input is not a valid word
+        """
+        if input == FILLER_KEYWORD: return True
+        return self.isWord(input)
+
+# Corpora already loaded in this process, keyed by the absolute path of the answers CSV
+_corpora = {}
+_corpora_lock = threading.Lock()
+
+def loadCorpus(file_path, inputs_path=None):
+    """
+    Returns the 'WordCorpus' for an answers CSV, reading the files only the first time it is requested.
+    """
+    key = (os.path.abspath(file_path), inputs_path and os.path.abspath(inputs_path))
+    with _corpora_lock:
+        metrics.countCache("corpus", key in _corpora)
+        if key not in _corpora:
+            _corpora[key] = WordCorpus.fromFiles(file_path, inputs_path)
+        return _corpora[key]
+
+class Scorer:
+    """
+    A ranking strategy for 'bestNextWords'.
+
+    Attributes:
+        name (str): Name used as the 'mode' of 'bestNextWords'.
+        function (callable): function(corpus, words, data, rows) returning a score for the inputs
+                             'corpus.all_inputs[rows]' at once (every input when 'rows' is None), given
+                             the candidate answers 'words' and their 'fetchData' statistics 'data'
+                             (which may be None).
+        higher_is_better (bool): Whether the best guesses have the highest or the lowest scores.
+        candidates_only (bool): Only rank the candidates themselves instead of every input.
+    """
+
+    def __init__(self, name, function, higher_is_better=True, candidates_only=False):
+        self.name = name
+        self.function = function
+        self.higher_is_better = higher_is_better
+        self.candidates_only = candidates_only
+
+    def rank(self, corpus, words, data, numWords, guesses=None, threshold=None):
+        """
+        Returns the best 'numWords' guesses as [word, score] pairs, best first.
+
+        Only words in 'guesses' (in 'all_inputs' order) are ranked when it is given, e.g. the legal
+        guesses in hard mode. Ties go to words that could be the answer, then to the earlier word
+        ('words' order when only candidates are ranked, 'all_inputs' order otherwise). With 'threshold',
+        only words scoring at least as well as it are returned.
+        """
+        return self.ranking(corpus, words, data, guesses).top(numWords, threshold)
+
+    def rankingSize(self, corpus, words, guesses=None):
+        """
+        Returns the number of guesses 'ranking' scores, without scoring them.
+        """
+        if not words:
+            return 0
+        if self.candidates_only:
+            return len(words)
+        return len(corpus.all_inputs) if guesses is None else len(guesses)
+
+    @instrumented("ranking", size_in=lambda self, corpus, words, *args, **kwargs: len(words),
+                  size_out=lambda result, *args, **kwargs: len(result))
+    def ranking(self, corpus, words, data, guesses=None):
+        """
+        Scores the guesses like 'rank' and returns them as a 'Ranking', which only sorts as far as it is read.
+        """
+        if not words:
+            return Ranking([], np.zeros(0))
+        candidate_rows = np.fromiter((corpus.input_index[word] for word in words), dtype=np.intp, count=len(words))
+
+        if self.candidates_only:
+            rows = candidate_rows
+        elif guesses is not None:
+            rows = np.fromiter((corpus.input_index[word] for word in guesses), dtype=np.intp, count=len(guesses))
+        else:
+            rows = None
+        scores = self.function(corpus, words, data, rows)
+
+        if self.candidates_only:
+            candidate = None
+        else:
+            candidate = np.zeros(len(corpus.all_inputs), dtype=bool)
+            candidate[candidate_rows] = True
+            if rows is not None:
+                candidate = candidate[rows]
+        return Ranking(corpus.all_inputs, scores, self.higher_is_better, candidate, rows)
+
+class Ranking:
+    """
+    Scored guesses of one turn, sorted lazily: reading the first k words only selects and sorts those k
+    (np.argpartition, then a sort of the selection) instead of sorting every guess.
+
+    The order is the one 'Scorer.rank' documents: best score first, then words that could be the answer,
+    then the earlier word.
+
+    Attributes:
+        words (Sequence[str]): The scored words, or the words 'rows' indexes into.
+        scores (np.ndarray): Score of every ranked word.
+        higher_is_better (bool): Whether the best words have the highest or the lowest scores.
+        candidate (np.ndarray): Whether each ranked word could be the answer, None when all of them could.
+        rows (np.ndarray): Index in 'words' of each score, None when 'scores' lines up with 'words'.
+    """
+
+    def __init__(self, words, scores, higher_is_better=True, candidate=None, rows=None):
+        self.words = words
+        self.scores = np.asarray(scores)
+        self.higher_is_better = higher_is_better
+        self.candidate = candidate
+        self.rows = rows
+        self._keys = -self.scores if higher_is_better else self.scores
+        self._order = np.zeros(0, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def order(self, k):
+        """
+        Returns the positions of the best 'k' scores, best first.
+        """
+        k = min(k, len(self))
+        if k > len(self._order):
+            # Sort a few more than asked for, so scrolling one row at a time doesn't select every time
+            self._order = self._select(min(max(k, 2 * len(self._order)), len(self)))
+        return self._order[:k]
+
+    def _select(self, k):
+        keys = self._keys
+        if k < len(keys):
+            # Every score tied with the k-th best is kept so the tie-breaks below decide between them
+            kth = np.partition(keys, k - 1)[k - 1]
+            selected = np.flatnonzero(keys <= kth)
+        else:
+            selected = np.arange(len(keys))
+        if self.candidate is None:
+            order = np.argsort(keys[selected], kind="stable")
+        else:
+            # lexsort sorts by the last key first: score, then candidates, then original order
+            order = np.lexsort((~self.candidate[selected], keys[selected]))
+        return selected[order[:k]]
+
+    def top(self, k, threshold=None):
+        """
+        Returns the best 'k' words as [word, score] pairs, best first.
+
+        With 'threshold', only words scoring at least as well as it are returned (at least 'threshold'
+        when higher scores are better, at most 'threshold' otherwise).
+        """
+        if threshold is not None:
+            limit = -threshold if self.higher_is_better else threshold
+            k = min(k, int(np.count_nonzero(self._keys <= limit)))
+        return self.page(0, k)
+
+    def __iter__(self):
+        """
+        Yields the [word, score] pairs best first, sorting in growing batches as they are consumed.
+        """
+        start, size = 0, 16
+        while start < len(self):
+            yield from self.page(start, start + size)
+            start += size
+            size *= 2
+
+    def page(self, start, stop):
+        """
+        Returns the [word, score] pairs ranked 'start' to 'stop' (exclusive), counted from 0.
+        """
+        order = self.order(stop)[start:]
+        rows = order if self.rows is None else self.rows[order]
+        return [[self.words[row], self.scores[i].item()] for row, i in zip(rows, order)]
+
+class BookRanking:
+    """
+    A 'Ranking' whose best words were read from the 'OpeningBook'. The other words are only scored
+    (by 'full') when a page goes past the stored ones, e.g. when a list is scrolled that far.
+
+    Attributes:
+        head (list): The stored [word, score] pairs, best first.
+        full (function): Takes no arguments and returns the live 'Ranking' of every word.
+        size (int): Number of words the live ranking has, see 'Scorer.rankingSize'.
+    """
+
+    def __init__(self, head, full, size):
+        self.head = head
+        self.full = full
+        self.size = size
+        self._ranking = None
+
+    def __len__(self):
+        return self.size if self._ranking is None else len(self._ranking)
+
+    def ranking(self):
+        if self._ranking is None:
+            self._ranking = self.full()
+        return self._ranking
+
+    def top(self, k, threshold=None):
+        if threshold is None and k <= len(self.head):
+            return self.page(0, k)
+        return self.ranking().top(k, threshold)
+
+    def __iter__(self):
+        yield from self.page(0, len(self.head))
+        yield from itertools.islice(self.ranking(), len(self.head), None)
+
+    def page(self, start, stop):
+        if stop <= len(self.head) or len(self.head) >= len(self):
+            return [list(pair) for pair in self.head[start:stop]]
+        return self.ranking().page(start, stop)
+
+def scoreOccurrences(corpus, words, data, rows):
+    """
+    'wordScore' of every input: the summed occurrences of its unique letters among 'words'.
+    """
+    occurrences = (data or fetchData(words))["occurrences"]
+    presence = corpus.letterPresence() if rows is None else corpus.letterPresence()[rows]
+    return presence @ np.array([occurrences[letter] for letter in ALPHABET], dtype=np.int64)
+
+def scoreEntropy(corpus, words, data, rows):
+    return corpus.entropyScores(words, rows)
+
+def scoreWorstCase(corpus, words, data, rows):
+    return corpus.patternCounts(words, rows).max(axis=1)
+
+def scoreExpectedRemaining(corpus, words, data, rows):
+    # A bucket of c candidates is hit with probability c / n and leaves c candidates
+    counts = corpus.patternCounts(words, rows)
+    return np.einsum("ij,ij->i", counts, counts) / len(words)
+
+def estimatedGuesses(size):
+    """
+    Rough number of guesses still needed to solve 'size' candidates, used below the lookahead depth.
+
+    Exact for 1 and 2 candidates (1 and 1.5 guesses), then assumes each guess gains about 2 bits.
+    """
+    return 1 + np.log2(np.maximum(size, 1)) / 2
+
+def expectedGuessesAfter(corpus, rows, columns):
+    """
+    Expected number of guesses to solve the answers 'columns' when guessing each input in 'rows' next,
+    estimating what comes after that guess with 'estimatedGuesses'.
+    """
+    patterns = corpus.patternMatrix()[np.ix_(rows, columns)].astype(np.intp)
+    patterns += np.arange(len(rows), dtype=np.intp)[:, None] * NUM_PATTERNS
+    counts = np.bincount(patterns.ravel(), minlength=len(rows) * NUM_PATTERNS).reshape(len(rows), NUM_PATTERNS)
+    counts[:, NUM_PATTERNS - 1] = 0
+    return 1 + (counts * estimatedGuesses(counts)).sum(axis=1) / len(columns)
+
+def evaluateFirstGuess(corpus, words, guess, second_rows, bound=np.inf, deadline=None):
     """
-    # Filter words that contain all letters
-    fillers = [word for word in all_inputs if all(letter in word for letter in letters)]
-    return fillers
+    Expected total number of guesses when guessing 'guess' now and the best of 'second_rows'
+    (or a candidate) next in every feedback bucket.
+
+    Buckets are evaluated from the largest down. A bucket of k candidates needs at least 2 - 1/k more
+    guesses, so once the exact cost so far plus that bound for the rest exceeds 'bound' the guess
+    can't beat it and None is returned. None is also returned once the 'time.monotonic' 'deadline' passes.
+    """
+    columns = np.fromiter((corpus.word_index[word] for word in words), dtype=np.intp, count=len(words))
+    feedback = np.asarray(corpus.patternMatrix()[corpus.input_index[guess], columns])
+    sizes = np.bincount(feedback, minlength=NUM_PATTERNS)
+    sizes[NUM_PATTERNS - 1] = 0
+    total = len(words)
+    remaining_bound = (sizes * (2 - 1 / np.maximum(sizes, 1))).sum() / total
+    expected = 1.0
+
+    for pattern in np.argsort(-sizes, kind="stable"):
+        size = sizes[pattern]
+        if size == 0:
+            break
+        remaining_bound -= size * (2 - 1 / size) / total
+        if size <= 2:
+            cost = estimatedGuesses(size)
+        else:
+            bucket = columns[feedback == pattern]
+            bucket_rows = [corpus.input_index[corpus.all_words[column]] for column in bucket]
+            rows = np.union1d(second_rows, bucket_rows)
+            cost = expectedGuessesAfter(corpus, rows, bucket).min()
+        expected += size * cost / total
+        if expected + remaining_bound > bound or (deadline is not None and time.monotonic() > deadline):
+            return None
+
+    return expected
+
+def _evaluateInWorker(source, words, guess, second_rows, bound, deadline):
+    return evaluateFirstGuess(loadCorpus(*source), words, guess, second_rows, bound, deadline)
+
+# Process pools used by lookahead ranking, keyed by number of processes
+_lookahead_pools = {}
+_lookahead_pools_lock = threading.Lock()
+
+def lookaheadPool(processes):
+    """
+    Returns the shared pool of 'processes' workers, started the first time it is needed.
+
+    Workers are started fresh rather than forked, a forked worker would inherit the caller's open
+    files and sockets (e.g. the server's listening socket and client connections) and keep them open.
+    They load the corpus from 'WordCorpus.source' instead.
+    """
+    with _lookahead_pools_lock:
+        if processes not in _lookahead_pools:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _lookahead_pools[processes] = concurrent.futures.ProcessPoolExecutor(
+                processes, mp_context=multiprocessing.get_context(method))
+        return _lookahead_pools[processes]
+
+def discardLookaheadPool(processes, pool):
+    """
+    Forgets a broken pool (a worker died or couldn't start), the next 'lookaheadPool' call starts a new one.
+    """
+    with _lookahead_pools_lock:
+        if _lookahead_pools.get(processes) is pool:
+            del _lookahead_pools[processes]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+class LookaheadScorer(Scorer):
+    """
+    Two-ply search: the 'top_k' first guesses by entropy are scored by the expected total number of
+    guesses when the best second guess is played in every feedback bucket.
+
+    Second guesses are drawn from the 'second_k' best inputs by entropy over all candidates plus the
+    bucket's own candidates. In hard mode both come from the current legal guesses, so a second
+    guess may occasionally ignore a hint revealed by the first one.
+
+    First guesses are evaluated in a process pool, see 'lookaheadPool' (in this process when
+    'processes' is 0, the corpus was not loaded from files, this is a daemonic worker or the pool
+    broke). Every worker loads the corpus and memory-maps the same pattern matrix cache. Guesses that
+    can't reach the current top 'numWords' are pruned, and when 'budget' seconds pass the guesses
+    evaluated so far are returned.
+
+    Scores are expected numbers of guesses, lower is better. When the budget runs out before any
+    guess is evaluated, the 'entropy' ranking is returned instead, with its own scores and order.
+    """
+
+    def __init__(self, name="lookahead", top_k=20, second_k=50, processes=None, budget=2.0):
+        super().__init__(name, None, higher_is_better=False)
+        self.top_k = top_k
+        self.second_k = second_k
+        self.processes = processes
+        self.budget = budget
+
+    def ranking(self, corpus, words, data, guesses=None):
+        """
+        Returns the 'top_k' guesses the search evaluated as a 'Ranking', the others have no score.
+        """
+        ranked = self.search(corpus, words, self.top_k, guesses)
+        if ranked is None:
+            return SCORERS["entropy"].ranking(corpus, words, data, guesses)
+        return Ranking([word for word, _ in ranked], [score for _, score in ranked], higher_is_better=False)
+
+    def rankingSize(self, corpus, words, guesses=None):
+        if len(words) <= 2:
+            return min(self.top_k, len(words))
+        return min(self.top_k, super().rankingSize(corpus, words, guesses))
+
+    def rank(self, corpus, words, data, numWords, guesses=None, threshold=None):
+        ranked = self.search(corpus, words, numWords, guesses)
+        if ranked is None:
+            # Entropy scores are bits, an expected-guesses threshold means nothing for them
+            return SCORERS["entropy"].rank(corpus, words, data, numWords, guesses)
+        if threshold is not None:
+            ranked = [pair for pair in ranked if pair[1] <= threshold]
+        return ranked
+
+    def search(self, corpus, words, numWords, guesses=None):
+        """
+        Runs the two-ply search.
+
+        Returns:
+            list: The best 'numWords' evaluated guesses as [word, expected guesses] pairs, best first,
+                  or None when the budget ran out before any guess was evaluated.
+        """
+        if len(words) <= 2:
+            return [[word, float(estimatedGuesses(len(words)))] for word in words[:numWords]]
+
+        deadline = time.monotonic() + self.budget
+        if guesses is None:
+            pool_rows = np.arange(len(corpus.all_inputs))
+        else:
+            pool_rows = np.fromiter((corpus.input_index[word] for word in guesses), dtype=np.intp, count=len(guesses))
+        entropy = corpus.entropyScores(words, None if guesses is None else pool_rows)
+        order = pool_rows[np.argsort(-entropy, kind="stable")]
+        first_guesses = [corpus.all_inputs[i] for i in order[:self.top_k]]
+        second_rows = order[:self.second_k]
+        candidates = set(words)
+        results = {}
+        evaluated = set()
+
+        def bound():
+            if len(results) < numWords:
+                return np.inf
+            return sorted(results.values())[numWords - 1]
+
+        def record(guess, expected):
+            evaluated.add(guess)
+            if expected is not None:
+                results[guess] = expected
+
+        # Daemonic processes (e.g. multiprocessing.Pool workers) can't start a pool of their own
+        if self.processes != 0 and corpus.source is not None and not multiprocessing.current_process().daemon:
+            pool = lookaheadPool(self.processes)
+            pending = {}
+            queue = list(first_guesses)
+            in_flight = (self.processes or os.cpu_count() or 1) * 2
+            try:
+                while queue or pending:
+                    # Keep a few tasks per worker in flight so later ones see a tighter bound
+                    while queue and len(pending) < in_flight:
+                        guess = queue.pop(0)
+                        pending[pool.submit(_evaluateInWorker, corpus.source, list(words), guess, second_rows, bound(), deadline)] = guess
+                    timeout = deadline - time.monotonic()
+                    done, _ = concurrent.futures.wait(pending, timeout=max(timeout, 0), return_when=concurrent.futures.FIRST_COMPLETED)
+                    if not done:
+                        # Queued tasks are dropped, running ones stop at the deadline by themselves
+                        for future in pending:
+                            future.cancel()
+                        break
+                    for future in done:
+                        record(pending.pop(future), future.result())
+            except concurrent.futures.process.BrokenProcessPool:
+                # The guesses the broken pool didn't evaluate are evaluated below
+                discardLookaheadPool(self.processes, pool)
+
+        for guess in first_guesses:
+            if time.monotonic() > deadline:
+                break
+            if guess not in evaluated:
+                record(guess, evaluateFirstGuess(corpus, words, guess, second_rows, bound(), deadline))
+
+        if not results:
+            return None
+        ranked = sorted(results.items(), key=lambda item: (item[1], item[0] not in candidates, first_guesses.index(item[0])))
+        return [[word, float(expected)] for word, expected in ranked[:numWords]]
+
+# Ranking strategies available to 'bestNextWords' by name
+SCORERS = {}
+
+def registerScorer(scorer):
+    """
+    Makes a 'Scorer' available to 'bestNextWords' under its name.
+    """
+    SCORERS[scorer.name] = scorer
+    return scorer
+
+def findScorer(mode):
+    """
+    Returns the 'Scorer' named 'mode' ('mode' itself when it already is one).
+    """
+    scorer = mode if isinstance(mode, Scorer) else SCORERS.get(mode)
+    if scorer is None:
+        raise ValueError(f"Unknown ranking mode: {mode}")
+    return scorer
+
+registerScorer(Scorer("occurrences", scoreOccurrences, candidates_only=True))
+registerScorer(Scorer("entropy", scoreEntropy))
+registerScorer(Scorer("minimax", scoreWorstCase, higher_is_better=False))
+registerScorer(Scorer("expected", scoreExpectedRemaining, higher_is_better=False))
+registerScorer(LookaheadScorer())
+
+class DecisionTree:
+    """
+    Precomputed suggestions for a fixed opener and ranking mode, built by 'decision_tree.py'.
+
+    Every suggestion is stored under the feedback patterns that lead to it, so a lookup is a
+    single dictionary access instead of filtering and ranking the candidates again.
+
+    Attributes:
+        mode (str): The 'bestNextWords' ranking mode the tree was built with.
+        opener (str): The first guess.
+        words_hash (str): 'WordCorpus.digest' of the word lists the tree was built from.
+        guesses (dict): Pattern path ("" for the first guess, then comma separated pattern ids) -> guess.
+    """
+
+    VERSION = 1
+
+    def __init__(self, mode, opener, words_hash, guesses):
+        self.mode = mode
+        self.opener = opener
+        self.words_hash = words_hash
+        self.guesses = guesses
+
+    @staticmethod
+    def pathKey(patterns):
+        return ",".join(str(pattern) for pattern in patterns)
+
+    @classmethod
+    def fromFile(cls, path, corpus=None):
+        """
+        Loads a tree file. If 'corpus' is given the tree must have been built from the same word lists.
+        """
+        with open(path, mode='r') as file:
+            content = json.load(file)
+        if content.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported decision tree version in {path}")
+        if corpus is not None and content["words_hash"] != corpus.digest():
+            raise ValueError(f"Decision tree {path} was built from different word lists")
+        return cls(content["mode"], content["opener"], content["words_hash"], content["guesses"])
+
+    def save(self, path):
+        content = {
+            "version": self.VERSION,
+            "mode": self.mode,
+            "opener": self.opener,
+            "words_hash": self.words_hash,
+            "guesses": self.guesses,
+        }
+        writeAtomically(path, lambda file: file.write(json.dumps(content, separators=(",", ":")).encode("utf-8")))
+
+    def nextGuess(self, history):
+        """
+        Returns the guess to play after 'history' ((word, positionValues) pairs), or None if
+        the history did not follow the tree's guesses.
+        """
+        patterns = []
+        for word, positionValues in history:
+            if self.guesses.get(self.pathKey(patterns)) != word:
+                return None
+            patterns.append(encodePattern(positionValues))
+        return self.guesses.get(self.pathKey(patterns))
+
+class OpeningBook:
+    """
+    Precomputed rankings for the first two turns, built by 'opening_book.py'.
+
+    For every ranking mode it stores the best first guesses, and for every opener the best second
+    guesses after each feedback pattern. Both turns are deterministic for a given opener, and they rank
+    the largest candidate sets of a game, so reading them from the book saves most of a game's work.
+
+    Attributes:
+        words_hash (str): 'WordCorpus.digest' of the word lists the book was built from.
+        count (int): Number of guesses stored per ranking, shorter rankings are complete.
+        strategies (dict): mode -> {"first": entry, "openers": {opener: {pattern id (str): entry}}}, where
+                           an entry is {"remaining": number of candidates, "ranked": [[word, score], ...]}
+    """
+
+    VERSION = 1
+
+    def __init__(self, words_hash, count, strategies):
+        self.words_hash = words_hash
+        self.count = count
+        self.strategies = strategies
+
+    @classmethod
+    def fromFile(cls, path, corpus=None):
+        """
+        Loads a book file. If 'corpus' is given the book must have been built from the same word lists.
+        """
+        with open(path, mode='r') as file:
+            content = json.load(file)
+        if content.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported opening book version in {path}")
+        if corpus is not None and content["words_hash"] != corpus.digest():
+            raise ValueError(f"Opening book {path} was built from different word lists")
+        return cls(content["words_hash"], content["count"], content["strategies"])
+
+    def save(self, path):
+        content = {
+            "version": self.VERSION,
+            "words_hash": self.words_hash,
+            "count": self.count,
+            "strategies": self.strategies,
+        }
+        writeAtomically(path, lambda file: file.write(json.dumps(content, separators=(",", ":")).encode("utf-8")))
+
+    def lookup(self, mode, history, remaining, numWords=None):
+        """
+        Returns the stored [word, score] pairs for the turn after 'history', or None when the book
+        doesn't cover it (another mode, a later turn, an opener or pattern that wasn't stored, other
+        candidates than the entry was ranked for, or more than 'count' words asked for).
+
+        Args:
+            mode (str): The ranking mode name.
+            history (list[tuple]): (word, positionValues) of the guesses played so far.
+            remaining (int): Number of candidates left. The candidates left after 'history' are a
+                             subset of the ones the entry was ranked for, so only the same number
+                             means the same candidates.
+            numWords (int): Number of words wanted, None for every stored word.
+        """
+        strategy = self.strategies.get(mode)
+        if strategy is None or len(history) > 1:
+            return None
+        if not history:
+            entry = strategy["first"]
+        else:
+            opener, positionValues = history[0]
+            entry = strategy["openers"].get(opener, {}).get(str(encodePattern(positionValues)))
+        if entry is None or entry["remaining"] != remaining:
+            return None
+        ranked = entry["ranked"]
+        if numWords is None:
+            return ranked
+        if numWords > len(ranked) and len(ranked) >= self.count:
+            return None
+        return ranked[:numWords]
+
+class SolverSession:
+    """
+    The state of one game. Sessions only share their read-only 'WordCorpus', so any number of
+    games can run side by side in one process.
+
+    Attributes:
+        corpus (WordCorpus): The word lists this game is played with.
+        possible_words (list[str]): All possible words, it should eventually be reduced to a list of
+                                    length 1, which should be the word that is the answer.
+        history (list[tuple]): (word, positionValues) of every guess filtered so far.
+        stats (LetterStats): Letter statistics of 'possible_words', updated as words are filtered out.
+        hard_mode (bool): Whether every guess must use all revealed hints.
+        hard_rules (Constraints): The hard mode rules revealed so far.
+        legal_guesses (list[str]): Inputs that follow 'hard_rules', narrowed every turn. Only kept in hard mode.
+        snapshots (list[tuple]): The state before each guess in 'history' plus the current one, see 'undo'.
+        redo_history (list[tuple]): Guesses taken back by 'undo', the next one to redo last.
+    """
+
+    def __init__(self, corpus, hard_mode=False):
+        self.corpus = corpus
+        self.hard_mode = hard_mode
+        self.reset()
+
+    @instrumented("filterWords", size_in=lambda self, *args, **kwargs: len(self.possible_words),
+                  size_out=lambda result, self, *args, **kwargs: len(self.possible_words))
+    def filterWords(self, word, positionValues):
+        """
+        Filters 'possible_words' based on the provided word and positional hints.
+
+        Args:
+            word (str): The word used for filtering.
+            positionValues (list[int]): List of positional hints (length 5):
+                - 0: The letter is not in the answer.
+                - 1: The letter is in the answer but not in the correct position.
+                - 2: The letter is in the correct position.
+
+        Filtering a new guess forgets the guesses that could be redone.
+        """
+        self.redo_history = []
+        self._applyGuess(word, positionValues)
+
+    def _applyGuess(self, word, positionValues):
+        kept, removed = Constraints.fromFeedback(word, positionValues).partition(self.possible_words)
+        # Subtract whichever side is smaller, removing most words is cheaper to rebuild from what is left
+        if len(removed) <= len(kept):
+            self.stats.remove(removed)
+        else:
+            self.stats = LetterStats.fromWords(kept)
+        self._data = None
+        self.possible_words = kept
+        self.history.append((word, list(positionValues)))
+
+        if self.hard_mode:
+            rules = Constraints.hardModeRules(word, positionValues)
+            self.hard_rules = self.hard_rules.combine(rules)
+            self.legal_guesses = rules.apply(self.legal_guesses)
+        self.snapshots.append(self._snapshot())
+
+    def _snapshot(self):
+        """
+        Captures the state after a turn. Candidates and legal guesses are kept as bitsets over
+        'all_words' and 'all_inputs' (a few hundred bytes a turn), the statistics as small arrays.
+        """
+        words = np.zeros(len(self.corpus.all_words), dtype=bool)
+        words[[self.corpus.word_index[word] for word in self.possible_words]] = True
+        guesses = None
+        if self.hard_mode:
+            guesses = np.zeros(len(self.corpus.all_inputs), dtype=bool)
+            guesses[[self.corpus.input_index[word] for word in self.legal_guesses]] = True
+            guesses = np.packbits(guesses)
+        return np.packbits(words), guesses, self.stats.copy(), self.hard_rules
+
+    def _restore(self, snapshot):
+        words, guesses, stats, hard_rules = snapshot
+        columns = np.flatnonzero(np.unpackbits(words, count=len(self.corpus.all_words)))
+        self.possible_words = [self.corpus.all_words[i] for i in columns]
+        self.stats = stats.copy()
+        self._data = None
+        self.hard_rules = hard_rules
+        if guesses is not None:
+            rows = np.flatnonzero(np.unpackbits(guesses, count=len(self.corpus.all_inputs)))
+            self.legal_guesses = [self.corpus.all_inputs[i] for i in rows]
+
+    def undo(self, redoable=True):
+        """
+        Takes back the last guess, restoring the state before it from its snapshot without refiltering.
+
+        Args:
+            redoable (bool): False takes the guess back for good (e.g. one that left no possible words),
+                             'redo' won't filter it again.
+
+        Returns:
+            tuple: The (word, positionValues) taken back, or None when there is no guess to undo.
+        """
+        if not self.history:
+            return None
+        guess = self.history.pop()
+        self.snapshots.pop()
+        self._restore(self.snapshots[-1])
+        if redoable:
+            self.redo_history.append(guess)
+        return guess
+
+    def redo(self):
+        """
+        Filters the last guess taken back by 'undo' again.
+
+        Returns:
+            tuple: The (word, positionValues) redone, or None when there is no guess to redo.
+        """
+        if not self.redo_history:
+            return None
+        guess = self.redo_history.pop()
+        self._applyGuess(*guess)
+        return guess
+
+    def editGuess(self, turn, positionValues, word=None):
+        """
+        Changes the feedback (and optionally the word) of an earlier guess. The state before that guess is
+        restored from its snapshot and only that guess and the ones after it are filtered again.
+
+        Args:
+            turn (int): Index of the guess in 'history', counted from 0.
+            positionValues (list[int]): The corrected position values.
+            word (str): The corrected word, None to keep the guessed word.
+
+        Raises:
+            IndexError: If there is no guess 'turn'.
+            ValueError: If the edit leaves no possible words or, in hard mode, makes one of the replayed
+                        guesses ignore a hint revealed before it. The game is left as it was.
+        """
+        if not 0 <= turn < len(self.history):
+            raise IndexError(f"No guess {turn} to edit")
+        history, snapshots = list(self.history), list(self.snapshots)
+        replayed = self.history[turn:]
+        replayed[0] = (word or replayed[0][0], list(positionValues))
+        del self.history[turn:]
+        del self.snapshots[turn + 1:]
+        self._restore(self.snapshots[turn])
+        try:
+            for offset, guess in enumerate(replayed):
+                if self.hard_mode and not self.hard_rules.matches(guess[0]):
+                    raise ValueError(f"Hard mode: guess {turn + offset + 1} ({guess[0]}) no longer uses every revealed hint")
+                self._applyGuess(*guess)
+            if not self.possible_words:
+                raise ValueError("No words match the edited guesses")
+        except ValueError:
+            self.history, self.snapshots = history, snapshots
+            self._restore(snapshots[-1])
+            raise
+
+    def isLegalGuess(self, word):
+        """
+        Returns True if 'word' is in 'all_inputs' and, in hard mode, uses every revealed hint.
+        """
+        return self.corpus.isWord(word) and (not self.hard_mode or self.hard_rules.matches(word))
+
+    def currentData(self):
+        """
+        Returns the 'fetchData' statistics of 'possible_words' without recounting them.
+        """
+        metrics.countCache("letter_data", self._data is not None)
+        if self._data is None:
+            self._data = self.stats.toDict()
+        return self._data
+
+    @instrumented("bestNextWords", size_in=lambda self, *args, **kwargs: len(self.possible_words),
+                  size_out=lambda result, *args, **kwargs: len(result))
+    def bestNextWords(self, numWords, data, mode="occurrences", threshold=None):
+        """
+        Ranks guesses and returns the best ones.
+
+        Only the best 'numWords' are selected and sorted, see 'Ranking'. The first two turns are read
+        from the corpus' 'OpeningBook' when it covers them.
+
+        Args:
+            numWords (int): Number of words to return.
+            data (dict): The letter statistics generated by 'fetchData', only used by the 'occurrences' mode.
+            mode (str or Scorer): A name in 'SCORERS' or a 'Scorer':
+                - 'occurrences': ranks 'possible_words' by 'wordScore'.
+                - 'entropy': expected information of the feedback, in bits.
+                - 'minimax': size of the largest group of candidates left after the feedback.
+                - 'expected': expected number of candidates left after the feedback.
+                - 'lookahead': expected total guesses from a two-ply search, see 'LookaheadScorer'.
+                All but 'occurrences' rank every word in 'all_inputs' and prefer possible answers on ties.
+            threshold (float): Only return words scoring at least as well as this.
+
+        Returns:
+            list: [word, score] pairs sorted from best to worst.
+        """
+        scorer = findScorer(mode)
+        if threshold is None:
+            ranked = self.bookSuggestions(scorer, numWords)
+            if ranked is not None:
+                return [list(pair) for pair in ranked]
+        return scorer.rank(self.corpus, self.possible_words, data, numWords, self.legal_guesses, threshold)
+
+    def bookSuggestions(self, mode="occurrences", numWords=None):
+        """
+        Returns the opening book's [word, score] pairs for this turn, or None when there is no book or
+        it doesn't cover the turn (including when 'possible_words' was set to other candidates than
+        'history' leaves). In hard mode only the first turn is read from the book, the book's second
+        guesses don't follow the revealed hints.
+        """
+        book = self.corpus.openingBook()
+        if book is None or (self.hard_mode and self.history):
+            return None
+        return book.lookup(findScorer(mode).name, self.history, len(self.possible_words), numWords)
+
+    def rankedWords(self, data, mode="occurrences"):
+        """
+        Yields the [word, score] pairs of 'bestNextWords' best first, for callers that stop early.
+        Scoring happens on the first 'next', sorting only as far as the words are consumed.
+        """
+        yield from findScorer(mode).ranking(self.corpus, self.possible_words, data, self.legal_guesses)
+
+    def rankLater(self, mode="occurrences"):
+        """
+        Captures what 'bestNextWords' needs from the current turn and returns a function that ranks it.
+
+        The returned function can run on another thread while this session keeps being filtered or reset,
+        filtering replaces 'possible_words' and 'legal_guesses' instead of changing them in place.
+
+        Args:
+            mode (str or Scorer): See 'bestNextWords'.
+
+        Returns:
+            function: Takes no arguments and returns a 'Ranking' of every guess 'bestNextWords' would rank.
+                      When the opening book covers this turn it is a 'BookRanking', which only scores
+                      the guesses past the stored ones if they are read.
+        """
+        scorer = findScorer(mode)
+        words, guesses, data = self.possible_words, self.legal_guesses, self.currentData()
+        full = lambda: scorer.ranking(self.corpus, words, data, guesses)
+        ranked = self.bookSuggestions(scorer)
+        if ranked is not None:
+            ranking = BookRanking(ranked, full, scorer.rankingSize(self.corpus, words, guesses))
+            return lambda: ranking
+        return full
+
+    @instrumented("findFillerWords", size_out=lambda result, *args, **kwargs: len(result))
+    def findFillerWords(self, letters, positions=None, rank=False):
+        """
+        Finds filler words like 'WordCorpus.findFillerWords', keeping only legal guesses in hard mode.
+
+        With 'rank', fillers covering the most unresolved letters come first. A letter is unresolved when
+        some but not all of 'possible_words' contain it, and each one counts as the number of candidates
+        containing it.
+        """
+        fillers = self.corpus.findFillerWords(letters, positions)
+        if self.hard_mode:
+            fillers = self.hard_rules.apply(fillers)
+        if rank:
+            total = len(self.possible_words)
+            occurrences = self.currentData()["occurrences"]
+            unresolved = {letter: count for letter, count in occurrences.items() if 0 < count < total}
+            fillers.sort(key=lambda word: sum(unresolved.get(letter, 0) for letter in set(word)), reverse=True)
+        return fillers
+
+    def treeSuggestion(self, tree):
+        """
+        Returns the next guess stored in a 'DecisionTree' for this game's history, or None if the
+        game left the tree (a guess other than the tree's was played).
+        """
+        return tree.nextGuess(self.history)
+
+    def reset(self):
+        self.possible_words = list(self.corpus.all_words)
+        self.history = []
+        self.stats = self.corpus.word_stats.copy()
+        self._data = None
+        self.hard_rules = Constraints()
+        self.legal_guesses = list(self.corpus.all_inputs) if self.hard_mode else None
+        self.snapshots = [self._snapshot()]
+        self.redo_history = []
+
+class MultiBoardSession:
+    """
+    Several boards (Quordle, Octordle, ...) played with one shared sequence of guesses.
+
+    Each board keeps its candidates as column indices into the pattern matrix, so one guess filters
+    every board from the same matrix row, and ranking histograms all boards in one batched pass.
+
+    Attributes:
+        corpus (WordCorpus): The word lists the boards are played with.
+        boards (list[numpy.ndarray]): Candidate columns of each board.
+        solved (list[int]): Number of guesses it took to solve each board, None while unsolved.
+        history (list[tuple]): (word, list of positionValues per board) of every guess so far.
+    """
+
+    def __init__(self, corpus, num_boards):
+        self.corpus = corpus
+        self.boards = [np.arange(len(corpus.all_words)) for _ in range(num_boards)]
+        self.solved = [None] * num_boards
+        self.history = []
+
+    def activeBoards(self):
+        """
+        Returns the unsolved boards that still have candidates.
+        """
+        return [board for board, turns in enumerate(self.solved) if turns is None and len(self.boards[board])]
+
+    def emptyBoards(self):
+        """
+        Returns the unsolved boards no word matches anymore (inconsistent feedback was entered).
+        """
+        return [board for board, turns in enumerate(self.solved) if turns is None and not len(self.boards[board])]
+
+    def possibleWords(self, board):
+        return [self.corpus.all_words[column] for column in self.boards[board]]
+
+    def filterWords(self, word, patterns):
+        """
+        Filters every unsolved board with the feedback it showed for 'word'.
+
+        Args:
+            word (str): The guessed word.
+            patterns (list): Position values (see 'filterWords') for every board, solved boards are ignored.
+        """
+        feedback = self.corpus.patternMatrix()[self.corpus.input_index[word]]
+        for board in self.activeBoards():
+            pattern = encodePattern(patterns[board])
+            if pattern == NUM_PATTERNS - 1:
+                self.solved[board] = len(self.history) + 1
+                self.boards[board] = np.array([self.corpus.word_index[word]]) if word in self.corpus.word_index else self.boards[board][:0]
+            else:
+                columns = self.boards[board]
+                self.boards[board] = columns[feedback[columns] == pattern]
+        self.history.append((word, [None if values is None else list(values) for values in patterns]))
+
+    def boardScores(self, chunk_size=256):
+        """
+        Scores every input for all unsolved boards at once.
+
+        The candidate columns of all boards are gathered together, and each (board, pattern) pair gets
+        its own histogram bucket, so one bincount per chunk of inputs covers every board.
+
+        Returns:
+            numpy.ndarray: The summed entropy over the boards plus the expected number of boards
+                           the input solves outright (the chance that it is a board's answer).
+        """
+        active = self.activeBoards()
+        # Boards with the same candidates (e.g. every board before the first guess) are histogrammed once
+        groups = {}
+        for board in active:
+            groups.setdefault(self.boards[board].tobytes(), []).append(board)
+        distinct = [boards[0] for boards in groups.values()]
+        weights = np.array([len(boards) for boards in groups.values()])
+        if len(distinct) == 1:
+            scores = self.corpus.entropyScores(self.possibleWords(distinct[0])) * weights[0]
+            return self._addSolveChances(scores, active)
+
+        matrix = self.corpus.patternMatrix()
+        columns = np.concatenate([self.boards[board] for board in distinct])
+        sizes = np.array([len(self.boards[board]) for board in distinct])
+        column_offsets = np.repeat(np.arange(len(distinct)) * NUM_PATTERNS, sizes)
+        board_buckets = len(distinct) * NUM_PATTERNS
+        total_rows = len(self.corpus.all_inputs)
+        scores = np.zeros(total_rows)
+
+        for start in range(0, total_rows, chunk_size):
+            ids = matrix[start:start + chunk_size][:, columns].astype(np.intp)
+            rows = len(ids)
+            ids += column_offsets
+            ids += np.arange(rows, dtype=np.intp)[:, None] * board_buckets
+            counts = np.bincount(ids.ravel(), minlength=rows * board_buckets)
+            # Entropy of each board, H = log2(n) - sum(c * log2(c)) / n, over the non-empty buckets only
+            buckets = np.flatnonzero(counts)
+            bucket_sizes = counts[buckets]
+            weighted = np.bincount(buckets // NUM_PATTERNS, weights=bucket_sizes * np.log2(bucket_sizes),
+                                   minlength=rows * len(distinct)).reshape(rows, len(distinct))
+            scores[start:start + rows] = ((np.log2(sizes) - weighted / sizes) * weights).sum(axis=1)
+
+        return self._addSolveChances(scores, active)
+
+    def _addSolveChances(self, scores, active):
+        for board in active:
+            answers = [self.corpus.input_index[self.corpus.all_words[column]] for column in self.boards[board]]
+            scores[answers] += 1 / len(answers)
+        return scores
+
+    def bestNextWords(self, numWords):
+        """
+        Ranks every input by 'boardScores', preferring words that could be an answer on ties.
+
+        Returns:
+            list: [word, score] pairs sorted from best to worst.
+        """
+        if not self.activeBoards():
+            return []
+        scores = self.boardScores()
+        candidate = np.zeros(len(self.corpus.all_inputs), dtype=bool)
+        for board in self.activeBoards():
+            candidate[[self.corpus.input_index[self.corpus.all_words[column]] for column in self.boards[board]]] = True
+        return Ranking(self.corpus.all_inputs, scores, candidate=candidate).top(numWords)
+
+# Session used by the module level functions below (the console program and the GUI)
+default_session = None
+
+def __getattr__(name):
+    """
+    Exposes the default session's state as 'solver.possible_words', 'solver.all_words' and 'solver.all_inputs'.
+    The word lists are the corpus' own read-only tuples, not copies.
+    """
+    if name == "possible_words":
+        return default_session.possible_words if default_session else []
+    if name in ("all_words", "all_inputs"):
+        return getattr(default_session.corpus, name) if default_session else ()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@instrumented("fetchWords", size_out=lambda result, *args, **kwargs: len(default_session.possible_words))
+def fetchWords(file_path, hard_mode=False):
+    """
+    Loads the words of a CSV file (and 'all-inputs.csv' next to it) and starts a new default session with them.
+
+    The files are only read once per process, later calls share the already loaded 'WordCorpus'.
+    """
+    global default_session
+    default_session = SolverSession(loadCorpus(file_path), hard_mode)
+
+def setHardMode(hard_mode):
+    """
+    Restarts the default session with hard mode turned on or off.
+    """
+    global default_session
+    default_session = SolverSession(default_session.corpus, hard_mode)
+
+# Module level versions of the 'SolverSession' and 'WordCorpus' methods, working on the default session
+def getPatternMatrix():
+    return default_session.corpus.patternMatrix()
+
+def patternCounts(words):
+    return default_session.corpus.patternCounts(words)
+
+def entropyScores(words):
+    return default_session.corpus.entropyScores(words)
+
+def filterWords(word, positionValues):
+    default_session.filterWords(word, positionValues)
+
+def bestNextWords(numWords, data, mode="occurrences", threshold=None):
+    return default_session.bestNextWords(numWords, data, mode, threshold)
+
+def rankedWords(data, mode="occurrences"):
+    return default_session.rankedWords(data, mode)
+
+def rankLater(mode="occurrences"):
+    return default_session.rankLater(mode)
+
+def currentData():
+    return default_session.currentData()
+
+def findFillerWords(letters, positions=None, rank=False):
+    return default_session.findFillerWords(letters, positions, rank)
 
 def validInput(input):
+    return default_session.corpus.validInput(input)
+
+def isWord(word):
+    return default_session.corpus.isWord(word)
+
+def isLegalGuess(word):
+    return default_session.isLegalGuess(word)
+
+def validateMany(words):
+    return default_session.corpus.validateMany(words)
+
+def reset():
+    default_session.reset()
+
+def undo(redoable=True):
+    return default_session.undo(redoable)
+
+def redo():
+    return default_session.redo()
+
+def editGuess(turn, positionValues, word=None):
+    default_session.editGuess(turn, positionValues, word)
+
+def parsePositionValues(pattern):
+    """
+    Parses position values given as a string ('12000') or a list ([1, 2, 0, 0, 0]).
+
+    Raises:
+        ValueError: If the pattern is not 5 values from 0 to 2.
     """
-    Returns True if input is a word in all_inputs and if the word is 'filler'
-    Returns False if input is not found in all_inputs
+    try:
+        positionValues = [int(value) for value in (list(pattern) if isinstance(pattern, str) else pattern)]
+    except (TypeError, ValueError):
+        positionValues = []
+    if len(positionValues) != 5 or any(value not in (0, 1, 2) for value in positionValues):
+        raise ValueError(f"Invalid position values: {pattern!r}")
+    return positionValues
+
+def solveHistory(corpus, history, numWords=10, mode="occurrences", filler_letters=None, hard_mode=False):
+    """
+    Replays a game's guesses in a new session and returns the result as a dict.
 
     Args:
-        input (str): Represents what the user inputted as their word
-    
+        corpus (WordCorpus): The word lists to play with.
+        history (list): [word, pattern] pairs, patterns as accepted by 'parsePositionValues'.
+        numWords (int): Number of suggestions to return.
+        mode (str): The 'bestNextWords' ranking mode.
+        filler_letters (str): If given, filler words for these letters ranked for the game are included.
+        hard_mode (bool): Play in hard mode, every guess in 'history' must use the hints before it.
+
     Returns:
-        bool: True if input is a valid word and False if input is not a valid word
+        dict: 'remaining' and 'suggestions', plus 'fillers' when 'filler_letters' is given.
     """
-    if input == 'filler': return True
-    if input in all_inputs: return True
-    return False
+    session = SolverSession(corpus, hard_mode)
+    for word, pattern in history:
+        if not corpus.isWord(word):
+            raise ValueError(f"Invalid word: {word!r}")
+        if not session.isLegalGuess(word):
+            raise ValueError(f"Hard mode: {word!r} does not use every revealed hint")
+        session.filterWords(word, parsePositionValues(pattern))
 
-def reset():
-    global possible_words
-    possible_words = all_words.copy()
+    result = {
+        "remaining": len(session.possible_words),
+        "suggestions": session.bestNextWords(numWords, session.currentData(), mode),
+    }
+    if filler_letters is not None:
+        result["fillers"] = session.findFillerWords(filler_letters, rank=True)[:numWords]
+    return result
+
+def treeResult(tree, history):
+    """
+    Looks a game's next guess up in a 'DecisionTree' without replaying the game.
+
+    Returns:
+        dict: The single suggestion (its score is None), or None if the history left the tree.
+    """
+    guess = tree.nextGuess([(word, parsePositionValues(pattern)) for word, pattern in history])
+    return None if guess is None else {"suggestions": [[guess, None]]}
+
+def runBatch(input_stream, output_stream, file_path='all-answers.csv', batch_size=1000, numWords=10, mode="occurrences",
+             tree=None):
+    """
+    Non-interactive mode: reads one JSON game state per line and writes one JSON result per line.
+
+    Input records look like {"id": 1, "history": [["crane", "00120"], ...], "fillers": "ab", "hard_mode": true},
+    where "id", "fillers" and "hard_mode" are optional. Output records carry the same "id" plus the 'solveHistory' result,
+    or an "error" message. Lines are processed in batches of 'batch_size', identical game states
+    within a batch are only solved once, and the output is flushed after every batch.
+
+    With a 'DecisionTree', games that follow it are answered with its guess alone (see 'treeResult'),
+    only games that left the tree, ask for fillers or play in hard mode are replayed.
+    """
+    corpus = loadCorpus(file_path)
+
+    def solveBatch(lines):
+        results = {}
+        for line in lines:
+            if not line.strip():
+                continue
+            record = None
+            try:
+                record = json.loads(line)
+                history = tuple((str(word).lower(), str(pattern) if isinstance(pattern, str) else tuple(pattern))
+                                for word, pattern in record.get("history", []))
+                hard_mode = record.get("hard_mode", False)
+                if not isinstance(hard_mode, bool):
+                    raise ValueError("hard_mode must be true or false")
+                key = (history, record.get("fillers"), hard_mode)
+                if key not in results:
+                    try:
+                        result = None
+                        if tree is not None and key[1] is None and not key[2]:
+                            result = treeResult(tree, history)
+                        results[key] = result or solveHistory(corpus, history, numWords, mode, *key[1:])
+                    except (ValueError, TypeError) as error:
+                        results[key] = {"error": str(error)}
+                output = {"id": record.get("id"), **results[key]}
+            except (ValueError, TypeError, AttributeError) as error:
+                output = {"error": f"Invalid record: {error}"}
+                # Records that parsed as an object keep their id so the error can be matched to them
+                if isinstance(record, dict):
+                    output = {"id": record.get("id"), **output}
+            output_stream.write(json.dumps(output) + "\n")
+        output_stream.flush()
+
+    batch = []
+    for line in input_stream:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            solveBatch(batch)
+            batch = []
+    solveBatch(batch)
 
 # Console program
-def main():
+def main(hard_mode=False, tree=None):
     """
     Interactive Wordle helper tool.
     - Displays total possible words and top guesses at the start.
     - Allows input of position values without spaces (e.g., '12000').
     - Allows users to type 'filler' to find filler words.
+    - In hard mode, only accepts and suggests guesses that use every revealed hint.
+    - With a 'DecisionTree', suggests its guess instead of ranking while the game follows the tree.
     - Ends when only one possible word remains.
     """
 
     # Fetch all words from file
-    fetchWords('all-answers.csv')
-    print(f"Total words fetched: {len(possible_words)}")
-
-    # Get initial data
-    data = fetchData(possible_words)
-    print("\nTop 10 starting guesses:")
-    startingGuesses = bestNextWords(10, data)
-    for i in range(10):
-        print(f"{i + 1}. {startingGuesses[i][0]} (Score: {startingGuesses[i][1]})")
+    fetchWords('all-answers.csv', hard_mode)
+    session = default_session
+    print(f"Total words fetched: {len(session.possible_words)}")
+
+    if tree is not None:
+        print(f"\nDecision tree opener: {tree.opener}")
+    else:
+        # Get initial data
+        data = session.currentData()
+        print("\nTop 10 starting guesses:")
+        startingGuesses = bestNextWords(10, data)
+        for i in range(10):
+            print(f"{i + 1}. {startingGuesses[i][0]} (Score: {startingGuesses[i][1]})")
     
     # Game loop
-    while len(possible_words) > 1:
-        print(f"\nPossible words remaining: {len(possible_words)}")
+    while len(session.possible_words) > 1:
+        print(f"\nPossible words remaining: {len(session.possible_words)}")
         user_word = input("Enter your word (or type 'filler' to find filler words): ").strip().lower()
 
-        while validInput(user_word) == False:
-            print(f"\nInvalid Word: {user_word}. Try Again!")
+        while validInput(user_word) == False or (user_word != FILLER_KEYWORD and not isLegalGuess(user_word)):
+            if isWord(user_word):
+                print(f"\nHard mode: {user_word} does not use every revealed hint. Try Again!")
+            else:
+                print(f"\nInvalid Word: {user_word}. Try Again!")
             user_word = input("Enter your word (or type 'filler' to find filler words): ").strip().lower()
 
-        if user_word == "filler":
+        if user_word == FILLER_KEYWORD:
             letters = input("Enter letters to search for filler words: ").strip().lower()
             filler_words = findFillerWords(letters)
             print("\nFiller words:")
@@ -222,16 +1945,91 @@ def main():
         # Filter words based on user input
         filterWords(user_word, position_values)
 
-        if len(possible_words) == 1:
-            print(f"\nThe answer is: {possible_words[0]}")
+        # A game that still follows the tree gets its guess without ranking
+        guess = tree.nextGuess(session.history) if tree is not None else None
+        if len(session.possible_words) == 1:
+            print(f"\nThe answer is: {session.possible_words[0]}")
+        elif guess is not None and isLegalGuess(guess):
+            print(f"\nBest next word (decision tree): {guess}")
         else:
             # Update data for remaining words
-            data = fetchData(possible_words)
+            data = session.currentData()
             print(f"\nTop 10 possible words:")
             nextWords = bestNextWords(10, data)
             for i in range(len(nextWords)):
                 print(f"{i + 1}. {nextWords[i][0]} (Score: {nextWords[i][1]})")
             print(f"\nBest next word: {nextWords[0][0]}")
 
+def mainMultiBoard(num_boards):
+    """
+    Interactive helper for playing 'num_boards' boards at once with the same guesses.
+    - Asks for the position values of every unsolved board after each guess.
+    - Reports a board no word matches anymore and stops asking for it.
+    - Ends when every board is solved (or left without matching words).
+    """
+    corpus = loadCorpus('all-answers.csv')
+    session = MultiBoardSession(corpus, num_boards)
+
+    while session.activeBoards():
+        for board in session.activeBoards():
+            print(f"Board {board + 1}: {len(session.boards[board])} possible words")
+        nextWords = session.bestNextWords(10)
+        print("\nTop 10 possible words:")
+        for i in range(len(nextWords)):
+            print(f"{i + 1}. {nextWords[i][0]} (Score: {nextWords[i][1]})")
+
+        user_word = input("\nEnter your word: ").strip().lower()
+        while not corpus.isWord(user_word):
+            print(f"\nInvalid Word: {user_word}. Try Again!")
+            user_word = input("Enter your word: ").strip().lower()
+
+        patterns = [None] * num_boards
+        for board in session.activeBoards():
+            while patterns[board] is None:
+                try:
+                    patterns[board] = parsePositionValues(input(f"Enter the position values for board {board + 1} (e.g., 12000): ").strip())
+                except ValueError:
+                    print("\nPosition values must be 5 digits from 0 to 2. Try Again!")
+        empty = set(session.emptyBoards())
+        session.filterWords(user_word, patterns)
+
+        for board in session.emptyBoards():
+            if board not in empty:
+                print(f"Board {board + 1}: no words match your criteria. Please check your inputs.")
+        for board in session.activeBoards():
+            if len(session.boards[board]) == 1:
+                print(f"Board {board + 1}: the answer is {session.possibleWords(board)[0]}")
+
+    if session.emptyBoards():
+        solved = num_boards - len(session.emptyBoards())
+        print(f"\n{solved} of {num_boards} boards solved in {len(session.history)} guesses.")
+    else:
+        print(f"\nAll boards solved in {len(session.history)} guesses.")
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Wordle helper tool.")
+    parser.add_argument("--batch", action="store_true", help="read JSON game states from stdin and write results to stdout")
+    parser.add_argument("--batch-size", type=int, default=1000, help="records processed per batch")
+    parser.add_argument("--count", type=int, default=10, help="suggestions per record")
+    parser.add_argument("--mode", help="bestNextWords ranking mode (default: occurrences, or the tree's mode)")
+    parser.add_argument("--tree", help="decision tree file (see decision_tree.py) answering games that follow it")
+    parser.add_argument("--hard", action="store_true", help="play in hard mode")
+    parser.add_argument("--boards", type=int, default=1, help="number of boards played at once (Quordle: 4, Octordle: 8)")
+    args = parser.parse_args()
+
+    tree = None
+    if args.tree:
+        try:
+            tree = DecisionTree.fromFile(args.tree, loadCorpus('all-answers.csv'))
+        except (OSError, ValueError, KeyError) as error:
+            sys.exit(f"Could not load the decision tree: {error}")
+        if args.mode and args.mode != tree.mode:
+            sys.exit(f"The decision tree was built with mode {tree.mode!r}, not {args.mode!r}")
+    mode = args.mode or (tree.mode if tree else "occurrences")
+
+    if args.batch:
+        runBatch(sys.stdin, sys.stdout, batch_size=args.batch_size, numWords=args.count, mode=mode, tree=tree)
+    elif args.boards > 1:
+        mainMultiBoard(args.boards)
+    else:
+        main(args.hard, tree)